@@ -1,64 +1,127 @@
 """Main entry point for Orby Coder CLI."""
+import importlib
+import os
 import typer
-from typing import Optional
+from typer.core import TyperCommand, TyperGroup
+from typer.models import CommandInfo
+from typing import List
 import sys
 
-# Import our modules
-from orby_coder.commands.chat import chat_command
-from orby_coder.commands.code import code_command
-from orby_coder.commands.run import run_command
-from orby_coder.commands.ui import ui_command
-from orby_coder.config.config_manager import ConfigManager
-from orby_coder.ui.logo import print_logo
+from orby_coder.cli import LAZY_COMMANDS, ROOT_HELP
+
+# First arguments that never get the startup logo
+_NO_LOGO_CMDS = frozenset({"ui", "--help", "--version", "-h", "help"})
+
+class LazyTyperGroup(TyperGroup):
+    """Typer group that imports a subcommand's module only when it is invoked."""
+
+    def list_commands(self, ctx) -> list:
+        return list(LAZY_COMMANDS)
+
+    def get_command(self, ctx, cmd_name: str):
+        if cmd_name in self.commands:
+            return self.commands[cmd_name]
+        entry = LAZY_COMMANDS.get(cmd_name)
+        if entry is None:
+            return None
+        # Listing commands (e.g. `orby --help`) only needs the help text
+        return TyperCommand(name=cmd_name, help=entry[1])
+
+    def resolve_command(self, ctx, args):
+        if args and args[0] in LAZY_COMMANDS and args[0] not in self.commands:
+            self.commands[args[0]] = self._load_command(args[0])
+        return super().resolve_command(ctx, args)
+
+    def _load_command(self, cmd_name: str):
+        """Import the subcommand's module and build its click command."""
+        target, help_text = LAZY_COMMANDS[cmd_name]
+        module_name, func_name = target.split(":")
+        callback = getattr(importlib.import_module(module_name), func_name)
+        return typer.main.get_command_from_info(
+            CommandInfo(name=cmd_name, help=help_text, callback=callback),
+            pretty_exceptions_short=app.pretty_exceptions_short,
+            rich_markup_mode=app.rich_markup_mode,
+        )
 
 app = typer.Typer(
     name="orby",
-    help="Orby Coder - Open Source AI CLI for coding and development",
+    help=ROOT_HELP,
     add_completion=False,
+    cls=LazyTyperGroup,
 )
 
-# Add commands to the app
-app.command(name="chat", help="Start an interactive chat session or process a single prompt.")(chat_command)
-app.command(name="code", help="Generate, modify, or explain code based on a prompt.")(code_command)
-app.command(name="run", help="Execute a file and optionally explain or debug it.")(run_command)
-app.command(name="ui", help="Launch the Textual-based interactive UI.")(ui_command)
+_QUIET_FLAGS = frozenset({"--quiet", "-q"})
+
+_WELCOME = (
+    "\n📝 Welcome to Orby Coder!\n"
+    "   To get started, you'll need to install a local AI model:\n"
+    "   • For Ollama: Install from https://ollama.com and run 'ollama pull llama3.2'\n"
+    "   • For LM Studio: Install from https://lmstudio.ai and load a model\n"
+    "\n💡 Tip: Run 'orby ui' for the Gemini CLI-like interface\n"
+    "   Run 'orby chat --help' for chat command options\n"
+    "   Run 'orby code --help' for code generation options\n"
+    "   Run 'orby run --help' for file execution options\n"
+    "\n🔧 Configuration: ~/.orby/config.json\n"
+    "   Docs: https://github.com/jaskirat1616/OrbyCoder\n"
+    "\n"
+)
+
+@app.callback()
+def _root(
+    quiet: bool = typer.Option(False, "--quiet", "-q", help="Don't print the logo or welcome text")
+):
+    """Orby Coder - Open Source AI CLI for coding and development"""
+    if quiet:
+        os.environ["ORBY_QUIET"] = "1"
 
 def print_welcome_message():
     """Print a welcome message with setup instructions."""
-    print("\n📝 Welcome to Orby Coder!")
-    print("   To get started, you'll need to install a local AI model:")
-    print("   • For Ollama: Install from https://ollama.com and run 'ollama pull llama3.2'")
-    print("   • For LM Studio: Install from https://lmstudio.ai and load a model")
-    print("\n💡 Tip: Run 'orby ui' for the Gemini CLI-like interface")
-    print("   Run 'orby chat --help' for chat command options")
-    print("   Run 'orby code --help' for code generation options")
-    print("   Run 'orby run --help' for file execution options")
-    print("\n🔧 Configuration: ~/.orby/config.json")
-    print("   Docs: https://github.com/jaskirat1616/OrbyCoder")
-    print()
+    sys.stdout.write(_WELCOME)
+
+def _banner_enabled() -> bool:
+    """Whether the startup logo and welcome text should be printed."""
+    if os.environ.get("ORBY_QUIET") or os.environ.get("NO_COLOR"):
+        return False
+    # Piped or redirected output never shows the banner
+    return sys.stdout.isatty()
+
+def _leading_options(argv: List[str]) -> List[str]:
+    """Return the top-level options that precede the subcommand name."""
+    options = []
+    for arg in argv[1:]:
+        if not arg.startswith("-"):
+            break
+        options.append(arg)
+    return options
 
 def main():
     """Main entry point for the CLI."""
+    argv = sys.argv
+    # --quiet is parsed by Typer later, but the banner is printed before that
+    if _QUIET_FLAGS.intersection(_leading_options(argv)):
+        os.environ["ORBY_QUIET"] = "1"
+    show_banner = _banner_enabled()
     # Print logo on startup (for non-UI commands and when no specific command is given)
-    if len(sys.argv) == 1:
+    if show_banner and (len(argv) == 1 or argv[1] not in _NO_LOGO_CMDS):
+        from orby_coder.ui.logo import print_logo
         print_logo()
-        print_welcome_message()
+    
+    if len(argv) == 1:
         # Show help when no arguments are provided
-        app()
+        if show_banner:
+            print_welcome_message()
     else:
         # Initialize config
-        config = ConfigManager()
-        
-        # Print logo for non-UI commands only
-        if len(sys.argv) > 1 and sys.argv[1] not in ['ui', '--help', '--version', 'help']:
-            print_logo()
-        
-        # Run the Typer app
-        try:
-            app()
-        except KeyboardInterrupt:
-            typer.echo("\nGoodbye! 👋")
-            sys.exit(0)
+        from orby_coder.config.config_manager import ConfigManager
+        ConfigManager.instance()
+    
+    # Run the Typer app
+    try:
+        app()
+    except KeyboardInterrupt:
+        typer.echo("\nGoodbye! 👋")
+        sys.exit(0)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    from orby_coder.cli import main as cli_main
+    cli_main()
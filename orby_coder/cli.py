@@ -0,0 +1,49 @@
+"""Console script entry point for Orby Coder.
+
+`orby --help` is answered from the command table below without importing Typer
+or Rich, which take ~100ms to load and render; every other invocation goes to
+the Typer app in orby_coder.__main__.
+"""
+import os
+import sys
+from typing import Dict, Tuple
+
+ROOT_HELP = "Orby Coder - Open Source AI CLI for coding and development"
+
+# Subcommand name -> ("module:function", help). Command modules pull in Rich,
+# Textual, the LLM SDKs, etc., so they are only imported once dispatched.
+LAZY_COMMANDS: Dict[str, Tuple[str, str]] = {
+    "chat": ("orby_coder.commands.chat:chat_command", "Start an interactive chat session or process a single prompt."),
+    "code": ("orby_coder.commands.code:code_command", "Generate, modify, or explain code based on a prompt."),
+    "run": ("orby_coder.commands.run:run_command", "Execute a file and optionally explain or debug it."),
+    "ui": ("orby_coder.commands.ui:ui_command", "Launch the Textual-based interactive UI."),
+}
+
+# Arguments that may accompany --help on the fast path; none of them prints anything
+_HELP_ONLY_ARGS = frozenset({"--help", "--quiet", "-q"})
+
+def _prog_name() -> str:
+    name = os.path.basename(sys.argv[0])
+    return "python -m orby_coder" if name == "__main__.py" else name
+
+def _root_help() -> str:
+    """Top-level help in Click's plain layout."""
+    width = max(map(len, LAZY_COMMANDS))
+    commands = "\n".join(f"  {name.ljust(width)}  {entry[1]}" for name, entry in LAZY_COMMANDS.items())
+    return (
+        f"Usage: {_prog_name()} [OPTIONS] COMMAND [ARGS]...\n"
+        f"\n  {ROOT_HELP}\n"
+        "\nOptions:\n"
+        "  -q, --quiet  Don't print the logo or welcome text\n"
+        "  --help       Show this message and exit.\n"
+        f"\nCommands:\n{commands}\n"
+    )
+
+def main():
+    """Entry point for the `orby` script."""
+    args = sys.argv[1:]
+    if "--help" in args and _HELP_ONLY_ARGS.issuperset(args):
+        sys.stdout.write(_root_help())
+        return
+    from orby_coder.__main__ import main as app_main
+    app_main()
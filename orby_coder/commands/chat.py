@@ -1,21 +1,245 @@
 """Chat command for Orby Coder."""
+import functools
 import typer
 from typing import Optional
-from rich.console import Console
-from rich.panel import Panel
-from rich.markdown import Markdown
-from rich.spinner import Spinner
-from rich.live import Live
-from rich.text import Text
-from orby_coder.core.llm_provider import LocalLLMProvider
-from orby_coder.config.config_manager import ConfigManager
-from orby_coder.utils.advanced import TerminalExecutor, WebSearcher, get_system_info
-import threading
-import time
+from orby_coder.ui.console import get_console, markdown, write_stream
 
-console = Console()
 app = typer.Typer()
 
+# Ask the provider to merge tiny backend chunks into pieces of at least this size
+_STREAM_MIN_CHUNK = 128
+
+class ChatSession:
+    """State shared by the interactive chat loop and its command handlers."""
+    
+    def __init__(self, console, config_manager, config, llm):
+        self.console = console
+        self.config_manager = config_manager
+        self.config = config
+        self.llm = llm
+        self.web_searcher = None
+        self.running = True
+
+def _do_exit(session: ChatSession, arg: str):
+    session.console.print("[bold green]Goodbye![/bold green]")
+    session.running = False
+
+# Placeholders are ModelConfig fields; `.50` truncates the system prompt
+CONFIG_TEMPLATE = (
+    "Backend: {backend}\n"
+    "Default Model: {default_model}\n"
+    "LM Studio URL: {lmstudio_base_url}\n"
+    "Ollama URL: {ollama_base_url}\n"
+    "Temperature: {temperature}\n"
+    "Online Search: {enable_online_search}\n"
+    "Terminal Execution: {enable_terminal_execution}\n"
+    "System Prompt: {system_prompt:.50}..."
+)
+
+@functools.lru_cache(maxsize=None)
+def _help_panel():
+    """Build the static help panel once."""
+    from rich.panel import Panel
+    help_text = (
+        "[bold]Available Commands:[/bold]\n"
+        "• [green]help[/green] - Show this help message\n"
+        "• [green]models[/green] - List available models\n"
+        "• [green]model <name>[/green] - Change current model\n"
+        "• [green]config[/green] - Show current configuration\n"
+        "• [green]system[/green] - Show system information\n"
+        "• [green]temperature <value>[/green] - Set temperature (0.0-1.0)\n"
+        "• [green]clear[/green] - Clear screen\n"
+        "• [green]exit/quit/q[/green] - Exit the application\n"
+        "\n[bold]Advanced Usage:[/bold]\n"
+        "• [blue]execute: command[/blue] - Execute a terminal command\n"
+        "• [blue]search: query[/blue] - Search the web\n"
+        "Type any prompt to chat with Orby."
+    )
+    return Panel(help_text, title="Help")
+
+def _do_help(session: ChatSession, arg: str):
+    session.console.print(_help_panel())
+
+def _do_models(session: ChatSession, arg: str):
+    from rich.panel import Panel
+    console = session.console
+    try:
+        # The provider reuses a recent listing itself
+        models = session.llm.list_models()
+        if models:
+            models_list = "\n".join([f"• {model}" for model in models])
+            console.print(Panel(models_list, title="Available Models"))
+        else:
+            console.print("[yellow]No models found or backend not accessible.[/yellow]")
+    except Exception as e:
+        console.print(f"[red]Error listing models:[/red] {str(e)}")
+
+def _do_model(session: ChatSession, arg: str):
+    # Change the current model
+    console = session.console
+    new_model = arg.strip()
+    if new_model:
+        # Update the config with the new model
+        session.config.default_model = new_model
+        session.config_manager.save_config(session.config)
+        console.print(f"[green]Model changed to:[/green] {new_model}")
+        console.print(f"[blue]Current model:[/blue] {session.config.default_model}")
+    else:
+        console.print("[red]Please specify a model name.[/red]")
+        console.print("[yellow]Usage:[/yellow] model <model_name>")
+
+def _do_config(session: ChatSession, arg: str):
+    from rich.panel import Panel
+    config_info = CONFIG_TEMPLATE.format(**vars(session.config))
+    session.console.print(Panel(config_info, title="Configuration"))
+
+def _do_system(session: ChatSession, arg: str):
+    from rich.panel import Panel
+    from orby_coder.utils.advanced import get_system_info
+    try:
+        sys_info = get_system_info()
+    except ImportError as e:
+        session.console.print(f"[red]Error:[/red] {e}")
+        return
+    sys_text = (
+        f"CPU Usage: {sys_info['cpu_percent']}%\n"
+        f"Memory: {sys_info['memory_percent']:.1f}% ({sys_info['memory_available'] // (1024**3)}GB free)\n"
+        f"Disk: {sys_info['disk_percent']:.1f}% used\n"
+    )
+    session.console.print(Panel(sys_text, title="System Information"))
+
+def _do_temperature(session: ChatSession, arg: str):
+    console = session.console
+    try:
+        temp_value = float(arg)
+        if 0.0 <= temp_value <= 1.0:
+            session.config.temperature = temp_value
+            session.config_manager.save_config(session.config)
+            console.print(f"[green]Temperature set to:[/green] {temp_value}")
+        else:
+            console.print("[red]Temperature must be between 0.0 and 1.0[/red]")
+    except ValueError:
+        console.print("[red]Invalid temperature command. Use: temperature <value>[/red]")
+
+def _do_clear(session: ChatSession, arg: str):
+    session.console.clear()
+
+def _do_execute(session: ChatSession, arg: str):
+    console = session.console
+    if session.config.enable_terminal_execution:
+        from orby_coder.utils.advanced import TerminalExecutor
+        command = arg.strip()
+        if TerminalExecutor.safe_command(command):
+            console.print(f"[bold yellow]Executing:[/bold yellow] {command}")
+            result = TerminalExecutor.execute_command(command)
+            if result['success']:
+                console.print(f"[green]Command succeeded:[/green]")
+                if result['stdout']:
+                    console.print(result['stdout'])
+                if result['stderr']:
+                    console.print(f"[red]Stderr:[/red] {result['stderr']}")
+            else:
+                console.print(f"[red]Command failed:[/red] {result['stderr']}")
+        else:
+            console.print(f"[red]Unsafe command blocked:[/red] {command}")
+    else:
+        console.print("[red]Terminal execution is disabled in configuration.[/red]")
+
+def _do_search(session: ChatSession, arg: str):
+    from rich.panel import Panel
+    console = session.console
+    if session.config.enable_online_search:
+        query = arg.strip()
+        console.print(f"[bold yellow]Searching:[/bold yellow] {query}")
+        if session.web_searcher is None:
+            from orby_coder.utils.advanced import WebSearcher
+            session.web_searcher = WebSearcher()
+        results = session.web_searcher.search(query)
+        if results:
+            result_text = f"Results for '{query}':\n"
+            for i, result in enumerate(results[:3]):  # Show top 3 results
+                result_text += f"{i+1}. {result['title']}\n   {result['snippet'][:100]}...\n"
+            console.print(Panel(result_text, title="Web Search Results"))
+        else:
+            console.print(f"[red]No search results found for:[/red] {query}")
+    else:
+        console.print("[red]Online search is disabled in configuration.[/red]")
+
+# REPL commands matched against the lowercased input: whole-input commands first,
+# then prefixes in order. Prefix handlers get the text after the matched prefix.
+_EXACT_COMMANDS = {
+    "exit": _do_exit,
+    "quit": _do_exit,
+    "q": _do_exit,
+    "help": _do_help,
+    "models": _do_models,
+    "config": _do_config,
+    "system": _do_system,
+    "clear": _do_clear,
+    "cls": _do_clear,
+}
+_PREFIX_COMMANDS = (
+    ("model ", _do_model),
+    ("temperature ", _do_temperature),
+    ("execute:", _do_execute),
+    ("run:", _do_execute),
+    ("search:", _do_search),
+    ("find:", _do_search),
+)
+
+def _find_handler(user_input: str):
+    """Return (handler, argument) for a REPL command, or (None, None) for a chat prompt."""
+    lowered = user_input.lower()
+    handler = _EXACT_COMMANDS.get(lowered)
+    if handler is not None:
+        return handler, ""
+    for prefix, prefix_handler in _PREFIX_COMMANDS:
+        if lowered.startswith(prefix):
+            return prefix_handler, user_input[len(prefix):]
+    return None, None
+
+def _render_response(llm, messages: list, model: Optional[str], stream: bool, verbose: bool, enable_context: bool) -> Optional[str]:
+    """Send `messages` to the model and render the reply; returns None if the request failed."""
+    from rich.panel import Panel
+    console = get_console()
+    
+    live = None
+    if verbose:
+        # Show a thinking indicator while the model works
+        from rich.live import Live
+        from rich.spinner import Spinner
+        live = Live(Spinner("clock", "Orby is thinking..."), console=console, refresh_per_second=10)
+        live.start()
+    try:
+        if stream and live is None:
+            console.print("[bold yellow]Orby:[/bold yellow] ", end="")
+            response = write_stream(llm.stream_chat(messages, model, enable_context, min_chunk_bytes=_STREAM_MIN_CHUNK))
+            console.print()  # New line after streaming
+            return response
+        
+        if stream:
+            response = "".join(llm.stream_chat(messages, model, enable_context, min_chunk_bytes=_STREAM_MIN_CHUNK))
+        else:
+            response = llm.chat_complete(messages, model, enable_context)
+        panel = Panel(markdown(response), title="Orby's Response")
+        if live is not None:
+            live.update(panel)
+        else:
+            console.print(panel)
+        return response
+    except Exception as e:
+        error_msg = str(e)
+        if live is not None:
+            live.update(Panel(f"[red]Error:[/red] {error_msg}", title="Error"))
+        else:
+            console.print(f"[red]Error:[/red] {error_msg}")
+            if "not found" in error_msg.lower() and "ollama pull" in error_msg:
+                console.print("[yellow]Tip:[/yellow] Run the suggested command to download the model first.")
+        return None
+    finally:
+        if live is not None:
+            live.stop()
+
 def chat_command(
     prompt: Optional[str] = typer.Argument(None, help="The prompt to send to the AI"),
     model: Optional[str] = typer.Option(None, "--model", "-m", help="Model to use for inference"),
@@ -25,150 +249,33 @@ def chat_command(
     enable_context: bool = typer.Option(True, "--context/--no-context", help="Enable enhanced context (web search, terminal commands)")
 ):
     """Start an interactive chat session or process a single prompt."""
-    config_manager = ConfigManager()
+    from orby_coder.core.llm_provider import get_llm
+    from orby_coder.config.config_manager import ConfigManager
+
+    console = get_console()
+    config_manager = ConfigManager.instance()
     config = config_manager.get_current_config()
     
     # Update temperature if provided
     if temperature is not None:
         config.temperature = temperature
     
-    llm = LocalLLMProvider(config)
-    web_searcher = WebSearcher()
+    llm = get_llm(config)
+    llm.warm_up()
     
     # If no prompt provided, start interactive mode
     if not prompt:
         console.print("[bold green]Starting Orby Coder Chat...[/bold green]")
         console.print("Type 'help' for commands, 'exit' to quit\n")
         
+        session = ChatSession(console, config_manager, config, llm)
         # Interactive chat loop with more Gemini CLI-like features
-        while True:
+        while session.running:
             user_input = console.input("[bold blue]You:[/bold blue] ")
             
-            if user_input.lower() in ['exit', 'quit', 'q']:
-                console.print("[bold green]Goodbye![/bold green]")
-                break
-            elif user_input.lower() == 'help':
-                help_text = (
-                    "[bold]Available Commands:[/bold]\n"
-                    "• [green]help[/green] - Show this help message\n"
-                    "• [green]models[/green] - List available models\n"
-                    "• [green]model <name>[/green] - Change current model\n"
-                    "• [green]config[/green] - Show current configuration\n"
-                    "• [green]system[/green] - Show system information\n"
-                    "• [green]temperature <value>[/green] - Set temperature (0.0-1.0)\n"
-                    "• [green]clear[/green] - Clear screen\n"
-                    "• [green]exit/quit/q[/green] - Exit the application\n"
-                    "\n[bold]Advanced Usage:[/bold]\n"
-                    "• [blue]execute: command[/blue] - Execute a terminal command\n"
-                    "• [blue]search: query[/blue] - Search the web\n"
-                    "Type any prompt to chat with Orby."
-                )
-                console.print(Panel(help_text, title="Help"))
-                continue
-            elif user_input.lower() == 'models':
-                try:
-                    models = llm.list_models()
-                    if models:
-                        models_list = "\n".join([f"• {model}" for model in models])
-                        console.print(Panel(models_list, title="Available Models"))
-                    else:
-                        console.print("[yellow]No models found or backend not accessible.[/yellow]")
-                except Exception as e:
-                    console.print(f"[red]Error listing models:[/red] {str(e)}")
-                continue
-            elif user_input.lower().startswith('model '):
-                # Change the current model
-                new_model = user_input[6:].strip()  # Remove 'model ' prefix
-                if new_model:
-                    # Validate that the model exists or at least has proper format
-                    if len(new_model) > 0:
-                        # Update the config with the new model
-                        config.default_model = new_model
-                        config_manager.save_config(config)
-                        console.print(f"[green]Model changed to:[/green] {new_model}")
-                        console.print(f"[blue]Current model:[/blue] {config.default_model}")
-                    else:
-                        console.print("[red]Please specify a model name.[/red]")
-                        console.print("[yellow]Usage:[/yellow] model <model_name>")
-                else:
-                    console.print("[red]Please specify a model name.[/red]")
-                    console.print("[yellow]Usage:[/yellow] model <model_name>")
-                continue
-            elif user_input.lower() == 'config':
-                config_info = (
-                    f"Backend: {config.backend}\n"
-                    f"Default Model: {config.default_model}\n"
-                    f"LM Studio URL: {config.lmstudio_base_url}\n"
-                    f"Ollama URL: {config.ollama_base_url}\n"
-                    f"Temperature: {config.temperature}\n"
-                    f"Online Search: {config.enable_online_search}\n"
-                    f"Terminal Execution: {config.enable_terminal_execution}\n"
-                    f"System Prompt: {config.system_prompt[:50]}..."
-                )
-                console.print(Panel(config_info, title="Configuration"))
-                continue
-            elif user_input.lower() == 'system':
-                sys_info = get_system_info()
-                sys_text = (
-                    f"CPU Usage: {sys_info['cpu_percent']}%\n"
-                    f"Memory: {sys_info['memory_percent']:.1f}% ({sys_info['memory_available'] // (1024**3)}GB free)\n"
-                    f"Disk: {sys_info['disk_percent']:.1f}% used\n"
-                )
-                console.print(Panel(sys_text, title="System Information"))
-                continue
-            elif user_input.lower().startswith('temperature '):
-                try:
-                    temp_str = user_input.split(' ', 1)[1]
-                    temp_value = float(temp_str)
-                    if 0.0 <= temp_value <= 1.0:
-                        config.temperature = temp_value
-                        # Update the config manager as well
-                        config_manager.save_config(config)
-                        console.print(f"[green]Temperature set to:[/green] {temp_value}")
-                    else:
-                        console.print("[red]Temperature must be between 0.0 and 1.0[/red]")
-                except (ValueError, IndexError):
-                    console.print("[red]Invalid temperature command. Use: temperature <value>[/red]")
-                continue
-            elif user_input.lower() in ['clear', 'cls']:
-                console.clear()
-                continue
-            
-            # Check for special commands
-            user_input_lower = user_input.lower()
-            if user_input_lower.startswith('execute:') or user_input_lower.startswith('run:'):
-                if config.enable_terminal_execution:
-                    command = user_input[8:].strip()  # Remove 'execute:' or 'run:'
-                    if TerminalExecutor.safe_command(command):
-                        console.print(f"[bold yellow]Executing:[/bold yellow] {command}")
-                        result = TerminalExecutor.execute_command(command)
-                        if result['success']:
-                            console.print(f"[green]Command succeeded:[/green]")
-                            if result['stdout']:
-                                console.print(result['stdout'])
-                            if result['stderr']:
-                                console.print(f"[red]Stderr:[/red] {result['stderr']}")
-                        else:
-                            console.print(f"[red]Command failed:[/red] {result['stderr']}")
-                    else:
-                        console.print(f"[red]Unsafe command blocked:[/red] {command}")
-                else:
-                    console.print("[red]Terminal execution is disabled in configuration.[/red]")
-                continue
-            elif user_input_lower.startswith('search:') or user_input_lower.startswith('find:'):
-                if config.enable_online_search:
-                    query = user_input[7:].strip()  # Remove 'search:' or 'find:'
-                    console.print(f"[bold yellow]Searching:[/bold yellow] {query}")
-                    results = web_searcher.search(query)
-                    if results:
-                        result_text = f"Results for '{query}':\n"
-                        for i, result in enumerate(results[:3]):  # Show top 3 results
-                            result_text += f"{i+1}. {result['title']}\n   {result['snippet'][:100]}...\n"
-                        console.print(Panel(result_text, title="Web Search Results"))
-                    else:
-                        console.print(f"[red]No search results found for:[/red] {query}")
-                else:
-                    console.print("[red]Online search is disabled in configuration.[/red]")
+            handler, arg = _find_handler(user_input)
+            if handler is not None:
+                handler(session, arg)
                 continue
             
             # Prepare messages for the AI
@@ -176,87 +283,11 @@ def chat_command(
                 {"role": "system", "content": config.system_prompt},
                 {"role": "user", "content": user_input}
             ]
-            
-            # Show a thinking indicator before processing
-            if verbose:
-                spinner = Spinner("clock", "Orby is thinking...")
-                with Live(spinner, console=console, refresh_per_second=10) as live:
-                    time.sleep(0.5)  # Brief pause to show thinking
-                    try:
-                        if stream:
-                            response = ""
-                            for chunk in llm.stream_chat(messages, model, enable_context):
-                                response += chunk
-                            live.update(Panel(Markdown(response), title="Orby's Response"))
-                            time.sleep(0.1)  # Brief pause before showing response
-                        else:
-                            response = llm.chat_complete(messages, model, enable_context)
-                            live.update(Panel(Markdown(response), title="Orby's Response"))
-                            time.sleep(0.1)  # Brief pause before showing response
-                    except Exception as e:
-                        error_msg = str(e)
-                        live.update(Panel(f"[red]Error:[/red] {error_msg}", title="Error"))
-                        time.sleep(2)  # Show error for 2 seconds
-                        continue
-            else:
-                try:
-                    if stream:
-                        console.print("[bold yellow]Orby:[/bold yellow] ", end="")
-                        response = ""
-                        for chunk in llm.stream_chat(messages, model, enable_context):
-                            console.print(chunk, end="", markup=False)
-                            response += chunk
-                        console.print()  # New line after streaming
-                    else:
-                        response = llm.chat_complete(messages, model, enable_context)
-                        panel = Panel(Markdown(response), title="Orby's Response")
-                        console.print(panel)
-                except Exception as e:
-                    error_msg = str(e)
-                    console.print(f"[red]Error:[/red] {error_msg}")
-                    if "not found" in error_msg.lower() and "ollama pull" in error_msg:
-                        console.print("[yellow]Tip:[/yellow] Run the suggested command to download the model first.")
-                    continue
+            _render_response(llm, messages, model, stream, verbose, enable_context)
     else:
         # Process single prompt
         messages = [
             {"role": "system", "content": config.system_prompt},
             {"role": "user", "content": prompt}
         ]
-        
-        if verbose:
-            spinner = Spinner("clock", "Orby is thinking...")
-            with Live(spinner, console=console, refresh_per_second=10) as live:
-                time.sleep(0.5)  # Brief pause to show thinking
-                try:
-                    if stream:
-                        response = ""
-                        for chunk in llm.stream_chat(messages, model, enable_context):
-                            response += chunk
-                        live.update(Panel(Markdown(response), title="Orby's Response"))
-                    else:
-                        response = llm.chat_complete(messages, model, enable_context)
-                        live.update(Panel(Markdown(response), title="Orby's Response"))
-                except Exception as e:
-                    error_msg = str(e)
-                    live.update(Panel(f"[red]Error:[/red] {error_msg}", title="Error"))
-                    return
-        else:
-            try:
-                if stream:
-                    console.print("[bold yellow]Orby:[/bold yellow] ", end="")
-                    response = ""
-                    for chunk in llm.stream_chat(messages, model, enable_context):
-                        console.print(chunk, end="", markup=False)
-                        response += chunk
-                    console.print()  # New line after streaming
-                else:
-                    response = llm.chat_complete(messages, model, enable_context)
-                    panel = Panel(Markdown(response), title="Orby's Response")
-                    console.print(panel)
-            except Exception as e:
-                error_msg = str(e)
-                console.print(f"[red]Error:[/red] {error_msg}")
-                if "not found" in error_msg.lower() and "ollama pull" in error_msg:
-                    console.print("[yellow]Tip:[/yellow] Run the suggested command to download the model first.")
-                return
\ No newline at end of file
+        _render_response(llm, messages, model, stream, verbose, enable_context)
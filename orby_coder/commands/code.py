@@ -1,22 +1,16 @@
 """Code command for Orby Coder."""
 import typer
 from typing import Optional
-from rich.console import Console
-from rich.panel import Panel
-from rich.markdown import Markdown
-from rich.syntax import Syntax
-from rich.spinner import Spinner
-from rich.live import Live
 import os
 from pathlib import Path
-from orby_coder.core.llm_provider import LocalLLMProvider
-from orby_coder.config.config_manager import ConfigManager
-from orby_coder.utils.advanced import copy_to_clipboard, IDEIntegration
-import time
+from orby_coder.ui.console import get_console, markdown, write_stream
+from orby_coder.utils.common import CODE_BLOCK_RE
 
-console = Console()
 app = typer.Typer()
 
+# Ask the provider to merge tiny backend chunks into pieces of at least this size
+_STREAM_MIN_CHUNK = 128
+
 def code_command(
     prompt: str = typer.Argument(..., help="The coding task or request"),
     file: Optional[Path] = typer.Option(None, "--file", "-f", help="File to modify or create"),
@@ -26,114 +20,130 @@ def code_command(
     explain: bool = typer.Option(False, "--explain", "-e", help="Explain the generated code"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Show verbose output"),
     clipboard: bool = typer.Option(False, "--clipboard", "-c", help="Copy generated code to clipboard"),
-    open_in_editor: Optional[str] = typer.Option(None, "--editor", help="Open file in editor (vscode, cursor)")
+    open_in_editor: Optional[str] = typer.Option(None, "--editor", help="Open file in editor (vscode, cursor)"),
+    yes: bool = typer.Option(False, "--yes", "-y", help="Skip confirmation prompts"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Always query the model instead of reusing cached responses")
 ):
     """Generate, modify, or explain code based on a prompt."""
-    config_manager = ConfigManager()
+    from rich.panel import Panel
+    from rich.spinner import Spinner
+    from rich.live import Live
+    from orby_coder.core.llm_provider import get_llm
+    from orby_coder.config.config_manager import ConfigManager
+    from orby_coder.core.response_cache import ResponseCache
+    from orby_coder.core.semantic_cache import SemanticCache
+    from orby_coder.utils.advanced import IDEIntegration
+
+    console = get_console()
+    config_manager = ConfigManager.instance()
     config = config_manager.get_current_config()
-    llm = LocalLLMProvider(config)
-    ide_integration = IDEIntegration(config)
     
-    # Prepare the system prompt for code generation
-    system_prompt = f"{config.system_prompt} You are an expert software developer. When providing code, always format it with proper syntax highlighting and include helpful comments."
-    
-    # If a file is specified, read its content and include it in the prompt
+    # If a file is specified, read its content and include it in the prompt. This is
+    # validated before the LLM provider is built so a bad --file fails immediately;
+    # a path that does not exist yet is a file to create.
     file_content = ""
     if file and file.exists():
-        with open(file, 'r') as f:
-            file_content = f.read()
+        if not file.is_file():
+            console.print(f"[red]Error:[/red] '{file}' is not a file")
+            raise typer.Exit(code=1)
+        try:
+            file_content = file.read_text(encoding="utf-8")
+        except UnicodeDecodeError:
+            console.print(f"[red]Error:[/red] '{file}' is not a UTF-8 text file")
+            raise typer.Exit(code=1)
         user_prompt = f"Here is the current file content:\n```\n{file_content}\n```\n\n{prompt}\n\nIf modifying, please provide the complete updated file."
     else:
         user_prompt = prompt
     
+    llm = get_llm(config)
+    llm.warm_up()
+    cache = ResponseCache(enabled=not no_cache)
+    ide_integration = IDEIntegration(config)
+    
+    # Prepare the system prompt for code generation
+    system_prompt = config.code_system_prompt
+    
     messages = [
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": user_prompt}
     ]
     
+    # With semantic_cache_threshold set, a paraphrase of an earlier prompt against
+    # the same file reuses that answer; seeding the exact cache lets the normal
+    # paths below replay it
+    semantic_cache = SemanticCache(config.semantic_cache_threshold, enabled=not no_cache)
+    model_name = model or config.default_model
+    semantic_context = f"{system_prompt}\0{file_content}"
+    similar = semantic_cache.lookup(model_name, semantic_context, prompt)
+    if similar is not None:
+        cache.set(cache.request_key(llm, messages, model), similar)
+    
     # Show thinking indicator if verbose
     if verbose:
         spinner = Spinner("clock", "Orby Coder is working on your code...")
         with Live(spinner, console=console, refresh_per_second=10) as live:
-            time.sleep(0.5)  # Brief pause to show thinking
             if stream:
-                response = ""
-                for chunk in llm.stream_chat(messages, model):
-                    response += chunk
-                live.update(Panel(Markdown(response), title="Code Generation Result"))
+                response = "".join(cache.stream_chat(llm, messages, model, min_chunk_bytes=_STREAM_MIN_CHUNK))
+                live.update(Panel(markdown(response), title="Code Generation Result"))
             else:
-                response = llm.chat_complete(messages, model)
-                live.update(Panel(Markdown(response), title="Code Generation Result"))
+                response = cache.chat_complete(llm, messages, model)
+                live.update(Panel(markdown(response), title="Code Generation Result"))
     else:
         if stream:
             console.print("[bold yellow]Orby Coder:[/bold yellow]\n", end="")
-            response = ""
-            for chunk in llm.stream_chat(messages, model):
-                console.print(chunk, end="", markup=False)
-                response += chunk
+            response = write_stream(cache.stream_chat(llm, messages, model, min_chunk_bytes=_STREAM_MIN_CHUNK))
             console.print()  # New line after streaming
         else:
-            response = llm.chat_complete(messages, model)
+            response = cache.chat_complete(llm, messages, model)
+            from rich.syntax import Syntax
             
-            # Try to detect and format code blocks
-            if "```" in response:
-                # This is a simple heuristic to format code blocks
-                parts = response.split("```")
-                has_code = False
-                for i, part in enumerate(parts):
-                    if i % 2 == 1:  # Odd indices are code blocks
-                        has_code = True
-                        # Extract language if specified
-                        lines = part.strip().split('\n')
-                        language = 'text'
-                        if lines:
-                            first_line = lines[0].strip()
-                            if first_line and not first_line.startswith('```'):
-                                language = first_line
-                                code_block = '\n'.join(lines[1:])  # Skip the language line
-                            else:
-                                code_block = part.strip()
-                            
-                            syntax = Syntax(code_block, language, theme="monokai", line_numbers=True)
-                            console.print(syntax)
-                            console.print()  # Add space after code block
-                    else:
-                        # Regular text
-                        if part.strip():
-                            # Don't duplicate text if it's already shown as code
-                            panel = Panel(Markdown(part.strip()), border_style="blue")
-                            console.print(panel)
-                
-                # If no code blocks found, show everything as markdown
-                if not has_code:
-                    panel = Panel(Markdown(response), title="Code Generation Result")
-                    console.print(panel)
+            # Render fenced code blocks with syntax highlighting and the text between them as markdown
+            pos = 0
+            has_code = False
+            for match in CODE_BLOCK_RE.finditer(response):
+                has_code = True
+                text = response[pos:match.start()].strip()
+                if text:
+                    console.print(Panel(markdown(text), border_style="blue"))
+                language = match.group(1).strip() or "text"
+                syntax = Syntax(match.group(2).rstrip(), language, theme="monokai", line_numbers=True)
+                console.print(syntax)
+                console.print()  # Add space after code block
+                pos = match.end()
+            
+            if has_code:
+                text = response[pos:].strip()
+                if text:
+                    console.print(Panel(markdown(text), border_style="blue"))
             else:
                 # If no code blocks detected, just print as markdown
-                panel = Panel(Markdown(response), title="Code Generation Result")
+                panel = Panel(markdown(response), title="Code Generation Result")
                 console.print(panel)
     
+    if similar is None and response:
+        semantic_cache.add(model_name, semantic_context, prompt, response)
+    
     # If explain flag is set, get explanation of the generated code
     if explain and response:
         console.print("\n[bold blue]Code Explanation:[/bold blue]")
         explanation_messages = [
-            {"role": "system", "content": f"{config.system_prompt} Explain the following code in a clear and concise manner, focusing on how it works and what it does."},
+            {"role": "system", "content": config.explain_system_prompt},
             {"role": "user", "content": f"Explain this code:\n\n{response}"}
         ]
         
         if verbose:
             spinner = Spinner("clock", "Generating explanation...")
             with Live(spinner, console=console, refresh_per_second=10) as live:
-                time.sleep(0.3)
-                explanation = llm.chat_complete(explanation_messages, model)
-                live.update(Panel(Markdown(explanation), title="Code Explanation"))
+                explanation = cache.chat_complete(llm, explanation_messages, model)
+                live.update(Panel(markdown(explanation), title="Code Explanation"))
         else:
-            explanation = llm.chat_complete(explanation_messages, model)
-            panel = Panel(Markdown(explanation), title="Code Explanation")
+            explanation = cache.chat_complete(llm, explanation_messages, model)
+            panel = Panel(markdown(explanation), title="Code Explanation")
             console.print(panel)
     
     # Copy to clipboard if requested
     if clipboard and response:
+        from orby_coder.utils.advanced import copy_to_clipboard
         if copy_to_clipboard(response):
             console.print(f"\n[green]Code copied to clipboard![/green]")
         else:
@@ -141,8 +151,7 @@ def code_command(
     
     # If output file is specified, write the response to it
     if output:
-        with open(output, 'w') as f:
-            f.write(response)
+        output.write_text(response, encoding="utf-8")
         console.print(f"\n[green]Code written to:[/green] {output}")
         
         # Open in editor if requested
@@ -160,10 +169,8 @@ def code_command(
     
     # If input file was specified and no output file is specified, ask if user wants to save
     elif file and not output:
-        save_choice = typer.confirm("Do you want to save the changes to the original file?")
-        if save_choice:
-            with open(file, 'w') as f:
-                f.write(response)
+        if yes or typer.confirm("Do you want to save the changes to the original file?"):
+            file.write_text(response, encoding="utf-8")
             console.print(f"[green]Changes saved to:[/green] {file}")
             
             # Open in editor if requested
@@ -1,23 +1,150 @@
 """Run command for Orby Coder."""
 import typer
 from typing import Optional
-from rich.console import Console
-from rich.panel import Panel
-from rich.markdown import Markdown
-from rich.syntax import Syntax
-from rich.spinner import Spinner
-from rich.live import Live
 import subprocess
+import codecs
+import hashlib
+import io
 import os
+import re
+import selectors
+import shutil
+import threading
 import time
+from concurrent.futures import Future
 from pathlib import Path
-from orby_coder.core.llm_provider import LocalLLMProvider
 from orby_coder.config.config_manager import ConfigManager
-from orby_coder.utils.advanced import TerminalExecutor, IDEIntegration, get_git_info, is_git_repo
+from orby_coder.core.response_cache import ResponseCache
+from orby_coder.core.prompt_compress import build_code_summary
+from orby_coder.ui.console import get_console, markdown
 
-console = Console()
+console = get_console()
 app = typer.Typer()
 
+# Re-render a streaming Markdown panel at most this often; each render re-parses the text
+_PANEL_REFRESH_SECONDS = 1 / 12
+# Ask the provider to merge tiny backend chunks into pieces of at least this size
+_STREAM_MIN_CHUNK = 128
+
+def _in_background(fn, *args) -> Future:
+    """Run `fn(*args)` on a daemon thread so Ctrl+C never waits for it."""
+    future = Future()
+    
+    def work():
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+    
+    threading.Thread(target=work, daemon=True).start()
+    return future
+
+# Compiled C/C++ programs, keyed by a hash of their sources and compile command
+_CC_CACHE_DIR = Path.home() / ".orby" / "cc-cache"
+_CC_FLAGS = ['-pipe', '-O2']
+# Files shorter than this many lines go to config.draft_model when one is set
+_DRAFT_MAX_LINES = 200
+_LOCAL_INCLUDE_RE = re.compile(rb'^\s*#\s*include\s+"([^"]+)"', re.MULTILINE)
+
+def _build_hash(source: Path, source_bytes: bytes, compile_cmd: list) -> str:
+    """Hash a C/C++ source, every local header it includes (directly or through
+    other headers) and the compile command.
+    
+    Quoted includes are resolved against the directory of the file that includes
+    them, as the compiler does.
+    """
+    digest = hashlib.sha256(" ".join(compile_cmd).encode("utf-8"))
+    digest.update(source_bytes)
+    seen = {source.resolve()}
+    pending = [(source.parent, source_bytes)]
+    while pending:
+        directory, content = pending.pop()
+        for header in _LOCAL_INCLUDE_RE.findall(content):
+            header_path = (directory / header.decode("utf-8", "replace")).resolve()
+            if header_path in seen or not header_path.is_file():
+                continue
+            seen.add(header_path)
+            header_bytes = header_path.read_bytes()
+            digest.update(str(header_path).encode("utf-8"))
+            digest.update(header_bytes)
+            pending.append((header_path.parent, header_bytes))
+    return digest.hexdigest()
+
+def _provider(config):
+    """Build the LLM provider. Its SDK imports are slow, so this only happens once a request is needed."""
+    from orby_coder.core.llm_provider import get_llm
+    llm = get_llm(config)
+    llm.warm_up()
+    return llm
+
+def _stream_subprocess(cmd: list, cwd: Path) -> subprocess.CompletedProcess:
+    """Run `cmd`, echoing its stdout and stderr (in red) as they arrive.
+    
+    Both streams are also captured for the later output analysis.
+    """
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=cwd)
+    if os.name == "nt":
+        # select() only works on sockets on Windows, so wait for the process instead
+        out, err = proc.communicate()
+        stdout, stderr = out.decode("utf-8", "replace"), err.decode("utf-8", "replace")
+        console.print(stdout, end="", markup=False, highlight=False)
+        console.print(stderr, end="", style="red", markup=False, highlight=False)
+        return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+    
+    captured = {proc.stdout: io.StringIO(), proc.stderr: io.StringIO()}
+    styles = {proc.stdout: None, proc.stderr: "red"}
+    # Reads can split multi-byte characters, so decode incrementally
+    decoders = {pipe: codecs.getincrementaldecoder("utf-8")("replace") for pipe in captured}
+    with selectors.DefaultSelector() as selector:
+        for pipe in captured:
+            selector.register(pipe, selectors.EVENT_READ)
+        while selector.get_map():
+            for key, _ in selector.select():
+                pipe = key.fileobj
+                data = os.read(pipe.fileno(), 4096)
+                if not data:
+                    selector.unregister(pipe)
+                    pipe.close()
+                text = decoders[pipe].decode(data, final=not data)
+                if text:
+                    captured[pipe].write(text)
+                    console.print(text, end="", style=styles[pipe], markup=False, highlight=False)
+    proc.wait()
+    return subprocess.CompletedProcess(
+        cmd, proc.returncode, captured[proc.stdout].getvalue(), captured[proc.stderr].getvalue()
+    )
+
+def _stream_panel(chunks, title: str, status: Optional[str] = None) -> str:
+    """Render streamed response chunks as a Markdown panel that grows in place.
+    
+    If `status` is given a spinner with that text is shown until the first chunk arrives.
+    Returns the complete response.
+    """
+    from rich.live import Live
+    from rich.markdown import Markdown
+    from rich.panel import Panel
+    from rich.spinner import Spinner
+    
+    if not console.is_terminal:
+        # Nothing to animate when piped; print the finished panel once
+        response = "".join(chunks)
+        console.print(Panel(markdown(response), title=title))
+        return response
+
+    parts = []
+    last_render = 0.0
+    initial = Spinner("clock", status) if status else Panel(Markdown(""), title=title)
+    with Live(initial, console=console, refresh_per_second=12) as live:
+        for chunk in chunks:
+            parts.append(chunk)
+            now = time.monotonic()
+            if now - last_render >= _PANEL_REFRESH_SECONDS:
+                live.update(Panel(Markdown("".join(parts)), title=title))
+                last_render = now
+        response = "".join(parts)
+        live.update(Panel(markdown(response), title=title))
+    return response
+
 def run_command(
     file: Path = typer.Argument(..., help="The file to run"),
     model: Optional[str] = typer.Option(None, "--model", "-m", help="Model to use for inference"),
@@ -25,20 +152,40 @@ def run_command(
     debug: bool = typer.Option(False, "--debug", "-d", help="Run with debugging output"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Show verbose output"),
     analyze: bool = typer.Option(False, "--analyze", "-a", help="Analyze code for potential issues"),
-    git_info: bool = typer.Option(False, "--git", "-g", help="Show git info for the project")
+    git_info: bool = typer.Option(False, "--git", "-g", help="Show git info for the project"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Always query the model instead of reusing cached responses")
 ):
     """Execute a file and optionally explain or debug it."""
-    config_manager = ConfigManager()
+    from rich.panel import Panel
+    from orby_coder.utils.advanced import IDEIntegration, get_git_info, is_git_repo
+    
+    config_manager = ConfigManager.instance()
     config = config_manager.get_current_config()
-    llm = LocalLLMProvider(config)
+    llm = _provider(config) if explain or analyze else None
+    cache = ResponseCache(enabled=not no_cache)
     ide_integration = IDEIntegration(config)
     
     if not file.exists():
         console.print(f"[red]Error:[/red] File '{file}' does not exist")
         raise typer.Exit(code=1)
     
+    # Read the file once; its hash keys cached explanations/analyses of unchanged files
+    code_bytes = file.read_bytes()
+    code_content = code_bytes.decode('utf-8', 'replace')
+    code_hash = hashlib.sha256(code_bytes).hexdigest()
+    # Small files are explained/analyzed by the faster draft model unless --model is given
+    task_model = model
+    if model is None and config.draft_model and code_content.count('\n') < _DRAFT_MAX_LINES:
+        task_model = config.draft_model
+    model_name = task_model or config.default_model
+    
     # Show git info if requested
-    if git_info and is_git_repo(str(file.parent)):
+    try:
+        in_repo = git_info and is_git_repo(str(file.parent))
+    except ImportError as e:
+        console.print(f"[yellow]Git info unavailable:[/yellow] {e}")
+        in_repo = False
+    if in_repo:
         git_data = get_git_info(str(file.parent))
         if 'error' not in git_data:
             git_panel = Panel(
@@ -76,91 +223,87 @@ def run_command(
             console.print(f"[red]Error:[/red] Not in a Rust project (no Cargo.toml found)")
             raise typer.Exit(code=1)
     elif ext in ['.c', '.cpp', '.cc', '.cxx']:
-        # For C/C++, compile first then run
+        # For C/C++, compile first then run; an unchanged source reuses its cached build
         executable = file.with_suffix('')
-        compile_cmd = ['gcc' if ext == '.c' else 'g++', '-o', str(executable), str(file)]
-        try:
-            result = subprocess.run(compile_cmd, capture_output=True, text=True)
+        compile_cmd = ['gcc' if ext == '.c' else 'g++', *_CC_FLAGS, '-o', str(executable), str(file)]
+        cached_build = _CC_CACHE_DIR / _build_hash(file, code_bytes, compile_cmd[:-3])
+        if cached_build.exists():
+            shutil.copy2(cached_build, executable)
+        else:
+            try:
+                result = subprocess.run(compile_cmd, capture_output=True, text=True)
+            except FileNotFoundError:
+                console.print(f"[red]Error:[/red] gcc/g++ not found. Please install a C/C++ compiler.")
+                raise typer.Exit(code=1)
             if result.returncode != 0:
                 console.print(f"[red]Compilation failed:[/red]\n{result.stderr}")
                 raise typer.Exit(code=1)
-            cmd = [str(executable)]
-        except FileNotFoundError:
-            console.print(f"[red]Error:[/red] gcc/g++ not found. Please install a C/C++ compiler.")
-            raise typer.Exit(code=1)
+            try:
+                _CC_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(executable, cached_build)
+            except OSError:
+                pass  # the cache is only an optimization
+        cmd = [str(executable.resolve())]
     else:
         console.print(f"[red]Error:[/red] Unsupported file extension: {ext}")
         console.print(f"[blue]Supported extensions:[/blue] .py, .js, .ts, .sh, .go, .rs, .c, .cpp, .cc, .cxx")
         raise typer.Exit(code=1)
     
+    # Explain and analyze share one summary of the file; large files are shrunk
+    # to their structure so prefill doesn't dominate latency
+    if explain or analyze:
+        prompt_code = build_code_summary(code_content, ext)
+    
+    if explain:
+        system_prompt = f"{config.system_prompt} You are an expert software developer. Provide a concise but comprehensive explanation of the code functionality."
+        explain_messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": f"Explain the following code:\n\n```\n{prompt_code}\n```"}
+        ]
+        explain_key = cache.make_file_key(model_name, "explain", code_hash, system_prompt, config.temperature, config.max_tokens)
+        # The explanation doesn't depend on the analysis, so when both are requested
+        # it is generated while the analysis streams
+        explain_future = _in_background(cache.chat_complete, llm, explain_messages, task_model, explain_key) if analyze else None
+    
     # If analyze flag is set, get AI to analyze the code for potential issues
     if analyze:
         console.print(f"[bold blue]Analyzing {file.name} for potential issues...[/bold blue]")
         
-        with open(file, 'r') as f:
-            code_content = f.read()
-        
         system_prompt = f"{config.system_prompt} Analyze the following code for potential issues, bugs, performance problems, or improvements. Be specific and provide actionable feedback."
         messages = [
             {"role": "system", "content": system_prompt},
-            {"role": "user", "content": f"Analyze this code for potential issues:\n\n```\n{code_content}\n```"}
+            {"role": "user", "content": f"Analyze this code for potential issues:\n\n```\n{prompt_code}\n```"}
         ]
+        cache_key = cache.make_file_key(model_name, "analyze", code_hash, system_prompt, config.temperature, config.max_tokens)
         
-        if verbose:
-            spinner = Spinner("clock", "Analyzing code...")
-            with Live(spinner, console=console, refresh_per_second=10) as live:
-                time.sleep(0.3)
-                analysis = llm.chat_complete(messages, model)
-                live.update(Panel(Markdown(analysis), title=f"Analysis of {file.name}"))
-        else:
-            analysis = llm.chat_complete(messages, model)
-            panel = Panel(Markdown(analysis), title=f"Analysis of {file.name}")
-            console.print(panel)
+        analysis = _stream_panel(
+            cache.stream_chat(llm, messages, task_model, key=cache_key, min_chunk_bytes=_STREAM_MIN_CHUNK),
+            f"Analysis of {file.name}",
+            "Analyzing code..." if verbose else None
+        )
     
     # If explain flag is set, first get the AI to explain the code
     if explain:
         console.print(f"[bold blue]Analyzing {file}...[/bold blue]")
         
-        with open(file, 'r') as f:
-            code_content = f.read()
-        
-        system_prompt = f"{config.system_prompt} You are an expert software developer. Provide a concise but comprehensive explanation of the code functionality."
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": f"Explain the following code:\n\n```\n{code_content}\n```"}
-        ]
-        
-        if verbose:
-            spinner = Spinner("clock", "Generating explanation...")
-            with Live(spinner, console=console, refresh_per_second=10) as live:
-                time.sleep(0.3)
-                explanation = llm.chat_complete(messages, model)
-                live.update(Panel(Markdown(explanation), title=f"Explanation of {file.name}"))
+        if explain_future is not None:
+            # Generated in the background while the analysis streamed; show it whole
+            with console.status("Generating explanation..."):
+                explanation = explain_future.result()
+            console.print(Panel(markdown(explanation), title=f"Explanation of {file.name}"))
         else:
-            explanation = llm.chat_complete(messages, model)
-            panel = Panel(Markdown(explanation), title=f"Explanation of {file.name}")
-            console.print(panel)
+            explanation = _stream_panel(
+                cache.stream_chat(llm, explain_messages, task_model, key=explain_key, min_chunk_bytes=_STREAM_MIN_CHUNK),
+                f"Explanation of {file.name}",
+                "Generating explanation..." if verbose else None
+            )
     
     # Run the file
     console.print(f"[bold green]Running {file.name}...[/bold green]")
     
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            cwd=file.parent
-        )
-        
-        # Print stdout if there is any
-        if result.stdout:
-            console.print("\n[bold]Output:[/bold]")
-            console.print(result.stdout)
-        
-        # Print stderr if there is any (in red)
-        if result.stderr:
-            console.print("\n[bold red]Errors:[/bold red]")
-            console.print(result.stderr)
+        console.print("\n[bold]Output:[/bold]")
+        result = _stream_subprocess(cmd, file.parent)
         
         # Show exit code
         if result.returncode != 0:
@@ -179,6 +322,8 @@ def run_command(
     if result.stdout or result.stderr:
         analyze_output = typer.confirm("Would you like AI analysis of the execution output?")
         if analyze_output:
+            if llm is None:
+                llm = _provider(config)
             output_content = f"STDOUT:\n{result.stdout}\n\nSTDERR:\n{result.stderr}" if result.stdout or result.stderr else "No output"
             
             system_prompt = f"{config.system_prompt} Analyze the following program output for correctness, errors, or insights."
@@ -187,16 +332,11 @@ def run_command(
                 {"role": "user", "content": f"Analyze this program output:\n\n{output_content}"}
             ]
             
-            if verbose:
-                spinner = Spinner("clock", "Analyzing output...")
-                with Live(spinner, console=console, refresh_per_second=10) as live:
-                    time.sleep(0.3)
-                    analysis = llm.chat_complete(messages, model)
-                    live.update(Panel(Markdown(analysis), title="Output Analysis"))
-            else:
-                analysis = llm.chat_complete(messages, model)
-                panel = Panel(Markdown(analysis), title="Output Analysis")
-                console.print(panel)
+            analysis = _stream_panel(
+                cache.stream_chat(llm, messages, model, min_chunk_bytes=_STREAM_MIN_CHUNK),
+                "Output Analysis",
+                "Analyzing output..." if verbose else None
+            )
         
         # Option to open in editor after running
         open_editor = typer.confirm("Would you like to open the file in an editor?")
@@ -1,20 +1,20 @@
 """UI command for Orby Coder using Textual."""
 import typer
-from typing import Optional
+from functools import cached_property
+from typing import List, Optional, Tuple
 from textual.app import App, ComposeResult
 from textual.containers import Container, Horizontal, Vertical, ScrollableContainer
-from textual.widgets import Header, Footer, TextArea, Static, ListView, ListItem, Label, LoadingIndicator
-from textual import events
-from rich.text import Text
+from textual.widgets import Header, TextArea, Static
+from textual import events, work
 from rich.markdown import Markdown
-import asyncio
-from orby_coder.core.llm_provider import LocalLLMProvider
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from orby_coder.core.llm_provider import get_llm
 from orby_coder.config.config_manager import ConfigManager
-from textual.reactive import reactive
-from textual.widgets import RichLog
 from textual.binding import Binding
-from textual.widgets._markdown import Markdown as MarkdownWidget
-from orby_coder.utils.advanced import TerminalExecutor, WebSearcher, IDEIntegration
+from textual.reactive import reactive
+from orby_coder.utils.common import extract_code_block
 
 console_app = typer.Typer()
 
@@ -24,27 +24,73 @@ class ThinkingAnimation(Static):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.dots = 0
+        self._timer = None
         self.update(f"[italic blue]●●●[/italic blue]")
         
     def on_mount(self) -> None:
-        self.set_interval(0.5, self._update_dots)
+        # Only ticks while the indicator is shown; see start()/stop()
+        self._timer = self.set_interval(0.5, self._update_dots, pause=True)
+    
+    def start(self) -> None:
+        """Start animating."""
+        if self._timer is not None:
+            self._timer.resume()
+    
+    def stop(self) -> None:
+        """Stop animating, so a hidden indicator causes no refreshes."""
+        if self._timer is not None:
+            self._timer.pause()
         
     def _update_dots(self) -> None:
         self.dots = (self.dots + 1) % 4
         dots_str = "●" * (self.dots + 1) + "○" * (3 - self.dots)
         self.update(f"[italic blue]{dots_str}[/italic blue]")
 
+# Parsed Markdown of message contents, bounded by the total length of the cached text
+_MARKDOWN_CACHE_MAX_CHARS = 2_000_000
+_markdown_cache: "OrderedDict[str, Markdown]" = OrderedDict()
+_markdown_cache_chars = 0
+
+def _render_markdown(content: str) -> Markdown:
+    """Return the parsed Markdown for `content`, reusing earlier parses of the same text."""
+    global _markdown_cache_chars
+    rendered = _markdown_cache.get(content)
+    if rendered is not None:
+        _markdown_cache.move_to_end(content)
+        return rendered
+    rendered = Markdown(content)
+    _markdown_cache[content] = rendered
+    _markdown_cache_chars += len(content)
+    while _markdown_cache_chars > _MARKDOWN_CACHE_MAX_CHARS and len(_markdown_cache) > 1:
+        evicted, _ = _markdown_cache.popitem(last=False)
+        _markdown_cache_chars -= len(evicted)
+    return rendered
+
 class MessageContainer(Vertical):
     """Container for a single message with role and content."""
     
-    def __init__(self, role: str, content: str):
+    def __init__(self, role: str, content: str, streaming: bool = False):
         super().__init__()
         self.role = role
         self.content = content
+        # Text that is still streaming in changes on every update, so it is
+        # parsed fresh instead of filling the cache with partial responses
+        self.dirty = streaming
+        self.index = -1  # position in ChatHistoryContainer.messages, set for streamed messages
+        self._body = Static(self._renderable(), markup=False)
+    
+    def _renderable(self) -> Markdown:
+        return Markdown(self.content) if self.dirty else _render_markdown(self.content)
+    
+    def update_content(self, content: str, final: bool = False):
+        """Replace the message text; `final` marks the end of a streamed message."""
+        self.content = content
+        self.dirty = not final
+        self._body.update(self._renderable())
         
     def compose(self) -> ComposeResult:
         # Use markdown for content to support rich formatting
-        markdown_content = MarkdownWidget(self.content)
+        markdown_content = self._body
         
         if self.role == "You":
             # User message styling
@@ -57,40 +103,111 @@ class MessageContainer(Vertical):
                 yield Static("🤖 Orby", classes="message-role assistant-role")
                 yield Container(markdown_content, classes="message-content assistant-content")
 
+# Messages mounted as widgets at once; older ones are mounted again when the
+# user scrolls back up to them
+_MOUNTED_WINDOW = 50
+# How many older messages to mount per scroll back to the top
+_MOUNT_PAGE = 25
+# Minimum time between re-renders of a message that is streaming in
+_STREAM_UPDATE_SECONDS = 0.05
+
 class ChatHistoryContainer(ScrollableContainer):
-    """Display chat history with proper message formatting."""
+    """Display chat history with proper message formatting.
+    
+    `messages` is the full transcript; only a window of it at the tail is mounted
+    as widgets, so layout cost stays bounded however long the session gets.
+    """
     
     def __init__(self):
         super().__init__()
-        self.messages = []
-        self._messages_to_add = []  # Store messages until mounted
+        self.messages: List[Tuple[str, str]] = []
+        self._first_mounted = 0  # index in `messages` of the first mounted message
+        self._scroll_pending = False
         self.border_title = "Chat"
     
     def compose(self) -> ComposeResult:
         """Compose the widget."""
-        # Add any pre-mounted messages
-        for role, content in self._messages_to_add:
+        self._first_mounted = max(0, len(self.messages) - _MOUNTED_WINDOW)
+        for role, content in self.messages[self._first_mounted:]:
             yield MessageContainer(role, content)
-            self.messages.append((role, content))
-        self._messages_to_add.clear()
     
     def add_message(self, role: str, content: str):
         """Add a message to the chat history."""
-        if self.is_mounted:
-            message_container = MessageContainer(role, content)
-            self.mount(message_container)
-            self.scroll_end(animate=False, speed=50)
-            self.messages.append((role, content))
-        else:
-            # Store for when widget is mounted
-            self._messages_to_add.append((role, content))
+        self.add_messages([(role, content)])
+    
+    def add_messages(self, pairs: List[Tuple[str, str]]):
+        """Add several messages with a single mount, layout pass and scroll."""
+        if not pairs:
+            return
+        self.messages.extend(pairs)
+        if not self.is_mounted:
+            return  # compose() mounts them
+        with self.app.batch_update():
+            self.mount(*(MessageContainer(role, content) for role, content in pairs))
+            self._trim_window()
+        self.request_scroll_end()
+    
+    def start_streaming_message(self, role: str) -> MessageContainer:
+        """Append an empty message whose text is filled in as it streams."""
+        self.messages.append((role, ""))
+        container = MessageContainer(role, "", streaming=True)
+        container.index = len(self.messages) - 1
+        with self.app.batch_update():
+            self.mount(container)
+            self._trim_window()
+        self.request_scroll_end()
+        return container
+    
+    def finish_streaming_message(self, container: MessageContainer, content: str):
+        """Store the complete text of a streamed message and render it from the cache."""
+        if container.index < len(self.messages):
+            self.messages[container.index] = (container.role, content)
+        container.update_content(content, final=True)
+    
+    def request_scroll_end(self):
+        """Scroll to the bottom after the next refresh.
+        
+        Requests made before that refresh (bulk appends, streaming updates) share a single scroll.
+        """
+        if not self._scroll_pending:
+            self._scroll_pending = True
+            self.call_after_refresh(self._do_scroll_end)
+    
+    def _do_scroll_end(self):
+        self._scroll_pending = False
+        self.scroll_end(animate=False)
+    
+    def _trim_window(self):
+        """Unmount the oldest mounted messages beyond the window."""
+        excess = len(self.messages) - self._first_mounted - _MOUNTED_WINDOW
+        if excess <= 0:
+            return
+        # One prune for the whole batch rather than a remove() per widget
+        self.remove_children(self.children[:excess])
+        self._first_mounted += excess
+    
+    def watch_scroll_y(self, old_value: float, new_value: float) -> None:
+        super().watch_scroll_y(old_value, new_value)
+        if new_value == 0 and old_value > 0 and self._first_mounted > 0:
+            self._mount_older()
+    
+    def _mount_older(self):
+        """Mount the page of messages before the first mounted one, keeping the view in place."""
+        start = max(0, self._first_mounted - _MOUNT_PAGE)
+        anchor = self.children[0] if self.children else None
+        self.mount(
+            *(MessageContainer(role, content) for role, content in self.messages[start:self._first_mounted]),
+            before=0
+        )
+        self._first_mounted = start
+        if anchor is not None:
+            self.call_after_refresh(self.scroll_to_widget, anchor, top=True, animate=False)
     
     def clear_messages(self):
         """Clear all messages from the chat history."""
-        for child in self.children:
-            child.remove()
+        self.remove_children()
         self.messages.clear()
-        self._messages_to_add.clear()
+        self._first_mounted = 0
 
 class CodeView(ScrollableContainer):
     """Display code content."""
@@ -117,18 +234,86 @@ class InputWidget(TextArea):
         self.language = "text"
 
 class StatusBar(Static):
-    """Status bar showing active model and backend."""
+    """Status bar showing active model and backend.
     
-    def __init__(self, config):
-        super().__init__()
+    Its text is rendered from reactive fields, so it is only redrawn when one of them changes.
+    """
+    
+    model = reactive("")
+    backend = reactive("")
+    online_search = reactive(False)
+    terminal_execution = reactive(False)
+    
+    def __init__(self, config, **kwargs):
+        super().__init__(**kwargs)
         self.config = config
         self.update_status()
     
     def update_status(self):
-        self.update(
-            f" Orby Coder | Model: {self.config.default_model} | Backend: {self.config.backend} | Online: {'ON' if self.config.enable_online_search else 'OFF'} | Terminal: {'ON' if self.config.enable_terminal_execution else 'OFF'} "
+        """Copy the displayed settings from the config."""
+        self.model = self.config.default_model
+        self.backend = self.config.backend
+        self.online_search = self.config.enable_online_search
+        self.terminal_execution = self.config.enable_terminal_execution
+    
+    def render(self) -> str:
+        return (
+            f" Model: {self.model} | Backend: {self.backend} | Search: {'ON' if self.online_search else 'OFF'}"
+            f" | Terminal: {'ON' if self.terminal_execution else 'OFF'} "
         )
 
+# Greeting shown when the TUI starts, similar to Gemini CLI
+_WELCOME_TEXT = (
+    "👋 Hello! I'm Orby, your AI coding assistant powered by Google DeepMind technology.\n\n"
+    "**What I can help you with:**\n"
+    "• 🧑‍💻 Explaining code and concepts\n"
+    "• 🛠️ Generating and debugging code\n"
+    "• 📚 Teaching programming fundamentals\n"
+    "• 🔍 Researching technical topics\n"
+    "• 🧪 Executing and testing code snippets\n\n"
+    "**Getting Started:**\n"
+    "Just type your coding question or task, and I'll assist you.\n"
+    "Type `help` for a list of special commands.\n\n"
+    "**Connected Tools:**\n"
+    "• 🔗 Web Search (enabled)\n"
+    "• 💻 Terminal Execution (enabled)\n"
+    "• 📂 IDE Integration (VSCode, Cursor)\n\n"
+    "*Powered by local AI models for privacy-focused assistance.*"
+)
+
+# Output of the `help` and `config` commands. Repeated output is the same text,
+# so its parsed Markdown comes from the message cache instead of being re-parsed.
+_HELP_TEMPLATE = (
+    "**Available Commands:**\n\n"
+    "- `help` - Show this help message\n"
+    "- `models` - List available models\n"
+    "- `config` - Show current configuration\n"
+    "- `system` - Show system information\n"
+    "- `clear` - Clear chat history\n"
+    "- `quit` or `exit` - Exit the application\n"
+    "- `temperature <value>` - Set temperature (0.0-1.0)\n\n"
+    "**Advanced Usage:**\n"
+    "- `execute: command` - Execute terminal command (enabled: {enable_terminal_execution})\n"
+    "- `search: query` - Web search (enabled: {enable_online_search})\n\n"
+    "**General Usage:**\n"
+    "Ask about code, request implementations, or explain concepts."
+)
+_CONFIG_TEMPLATE = (
+    "**Configuration:**\n"
+    "- Backend: {backend}\n"
+    "- Default Model: {default_model}\n"
+    "- LM Studio URL: {lmstudio_base_url}\n"
+    "- Ollama URL: {ollama_base_url}\n"
+    "- Temperature: {temperature}\n"
+    "- Online Search: {enable_online_search}\n"
+    "- Terminal Execution: {enable_terminal_execution}\n"
+    "- VSCode Path: {ide_integration.vscode_path}\n"
+    "- Cursor Path: {ide_integration.cursor_path}"
+)
+
+# Number of distinct prompts remembered in OrbyTUI.input_history
+_INPUT_HISTORY_SIZE = 500
+
 class OrbyTUI(App):
     """Main Textual application for Orby Coder - closely matching Gemini CLI UI."""
     
@@ -191,7 +376,12 @@ class OrbyTUI(App):
         font-size: small;
     }
     
+    MessageContainer {
+        height: auto;          /* Size to the message so the history can scroll */
+    }
+    
     .message-container {
+        height: auto;
         padding: 1 2;          /* More padding like Gemini */
         width: 1fr;
         border-bottom: solid #3a3a3a 1;  /* Subtle separators */
@@ -222,6 +412,7 @@ class OrbyTUI(App):
     
     .message-content {
         width: 1fr;
+        height: auto;
         padding-left: 1;
         color: #d4d4d4;        /* Light text */
     }
@@ -294,20 +485,57 @@ class OrbyTUI(App):
         Binding("ctrl+s", "search_panel", "Search", show=True),
     ]
     
-    def __init__(self, config):
+    def __init__(self, config, config_manager: Optional[ConfigManager] = None):
         super().__init__()
         self.config = config
-        self.llm = LocalLLMProvider(config)
-        self.ide_integration = IDEIntegration(config)
+        self._config_manager = config_manager or ConfigManager.instance()
+        self.llm = get_llm(config)
+        # /system samples the CPU on this single thread, created on first use, so
+        # psutil's per-thread baseline carries over from one report to the next
+        self._metrics_pool: Optional[ThreadPoolExecutor] = None
         self.chat_history = ChatHistoryContainer()
         self.code_view = CodeView()
         self.input_widget = InputWidget(placeholder="Message Orby...")
+        self.status_bar = StatusBar(config, id="status-bar")
         self.thinking_indicator = ThinkingAnimation(id="thinking-indicator")
         self.thinking_container = Horizontal(classes="thinking-container", id="thinking-container")
         self.thinking_container.visible = False
-        self.input_history = []
+        # Distinct prompts in submission order; the set mirrors the deque for membership tests
+        self.input_history = deque(maxlen=_INPUT_HISTORY_SIZE)
+        self._input_history_set = set()
         self.history_index = -1
         self.current_response = ""
+        # Built-in commands, matched on the lowercased prompt
+        self._exact_commands = {
+            "help": self._cmd_help,
+            "models": self._cmd_models,
+            "config": self._cmd_config,
+            "system": self._cmd_system,
+            "clear": self._cmd_clear,
+            "cls": self._cmd_clear,
+            "quit": self._cmd_quit,
+            "exit": self._cmd_quit,
+            "q": self._cmd_quit,
+        }
+        self._prefix_commands = (
+            ("temperature ", self._cmd_temperature),
+            ("execute:", self._cmd_execute),
+            ("run:", self._cmd_execute),
+            ("search:", self._cmd_search),
+            ("find:", self._cmd_search),
+        )
+    
+    @cached_property
+    def ide_integration(self):
+        """IDE integration helper, built on first use."""
+        from orby_coder.utils.advanced import IDEIntegration
+        return IDEIntegration(self.config)
+    
+    @cached_property
+    def web_searcher(self):
+        """Web searcher shared by every `search:` command, built on first use."""
+        from orby_coder.utils.advanced import WebSearcher
+        return WebSearcher()
     
     def compose(self) -> ComposeResult:
         """Create child widgets for the app."""
@@ -330,38 +558,21 @@ class OrbyTUI(App):
             yield self.input_widget
         
         # Status bar with Gemini-like styling
-        yield Static(
-            f" Model: {self.config.default_model} | Backend: {self.config.backend} | Search: {'ON' if self.config.enable_online_search else 'OFF'} | Terminal: {'ON' if self.config.enable_terminal_execution else 'OFF'} ",
-            id="status-bar"
-        )
+        yield self.status_bar
     
     def on_mount(self) -> None:
         """Called when app starts - add children after mounting."""
         # Add the thinking indicator to its container after both are mounted
         self.thinking_container.mount(self.thinking_indicator)
         
+        # Connect to the backend while the user types the first prompt
+        self.llm.warm_up()
+        
         # Focus the input widget
         self.input_widget.focus()
         
-        # Add welcome message similar to Gemini CLI
-        welcome_msg = (
-            "👋 Hello! I'm Orby, your AI coding assistant powered by Google DeepMind technology.\n\n"
-            "**What I can help you with:**\n"
-            "• 🧑‍💻 Explaining code and concepts\n"
-            "• 🛠️ Generating and debugging code\n"
-            "• 📚 Teaching programming fundamentals\n"
-            "• 🔍 Researching technical topics\n"
-            "• 🧪 Executing and testing code snippets\n\n"
-            "**Getting Started:**\n"
-            "Just type your coding question or task, and I'll assist you.\n"
-            "Type `help` for a list of special commands.\n\n"
-            "**Connected Tools:**\n"
-            "• 🔗 Web Search (enabled)\n"
-            "• 💻 Terminal Execution (enabled)\n"
-            "• 📂 IDE Integration (VSCode, Cursor)\n\n"
-            "*Powered by local AI models for privacy-focused assistance.*"
-        )
-        self.chat_history.add_message("Orby", welcome_msg)
+        # Add welcome message
+        self.chat_history.add_message("Orby", _WELCOME_TEXT)
 
     def on_text_area_submitted(self, message) -> None:
         """Handle text input submission."""
@@ -371,141 +582,18 @@ class OrbyTUI(App):
                 return
             
             # Add to input history
-            if prompt not in self.input_history:
+            if prompt not in self._input_history_set:
+                if len(self.input_history) == self.input_history.maxlen:
+                    self._input_history_set.discard(self.input_history[0])
                 self.input_history.append(prompt)
+                self._input_history_set.add(prompt)
             self.history_index = -1  # Reset history index after new input
             
             # Check for special commands
-            if prompt.lower() == 'help':
-                help_text = (
-                    "**Available Commands:**\n\n"
-                    "- `help` - Show this help message\n"
-                    "- `models` - List available models\n"
-                    "- `config` - Show current configuration\n"
-                    "- `system` - Show system information\n"
-                    "- `clear` - Clear chat history\n"
-                    "- `quit` or `exit` - Exit the application\n"
-                    "- `temperature <value>` - Set temperature (0.0-1.0)\n\n"
-                    "**Advanced Usage:**\n"
-                    f"- `execute: command` - Execute terminal command (enabled: {self.config.enable_terminal_execution})\n"
-                    f"- `search: query` - Web search (enabled: {self.config.enable_online_search})\n\n"
-                    "**General Usage:**\n"
-                    "Ask about code, request implementations, or explain concepts."
-                )
-                self.chat_history.add_message("Orby", help_text)
-                self.input_widget.text = ""
-                return
-            elif prompt.lower() == 'models':
-                try:
-                    models = self.llm.list_models()
-                    models_list = "\n".join([f"- {model}" for model in models])
-                    self.chat_history.add_message("Orby", f"**Available models:**\n{models_list}")
-                except Exception as e:
-                    self.chat_history.add_message("Orby", f"**Error listing models:** {str(e)}")
-                self.input_widget.text = ""
-                return
-            elif prompt.lower() == 'config':
-                config_info = (
-                    f"**Configuration:**\n"
-                    f"- Backend: {self.config.backend}\n"
-                    f"- Default Model: {self.config.default_model}\n"
-                    f"- LM Studio URL: {self.config.lmstudio_base_url}\n"
-                    f"- Ollama URL: {self.config.ollama_base_url}\n"
-                    f"- Temperature: {self.config.temperature}\n"
-                    f"- Online Search: {self.config.enable_online_search}\n"
-                    f"- Terminal Execution: {self.config.enable_terminal_execution}\n"
-                    f"- VSCode Path: {self.config.ide_integration.vscode_path}\n"
-                    f"- Cursor Path: {self.config.ide_integration.cursor_path}"
-                )
-                self.chat_history.add_message("Orby", config_info)
-                self.input_widget.text = ""
-                return
-            elif prompt.lower() == 'system':
-                import psutil
-                cpu_percent = psutil.cpu_percent(interval=1)
-                memory = psutil.virtual_memory()
-                
-                sys_info = (
-                    f"**System Information:**\n"
-                    f"- CPU Usage: {cpu_percent}%\n"
-                    f"- Memory: {memory.percent}% used ({memory.available // (1024**3)}GB free)\n"
-                    f"- Disk: {psutil.disk_usage('/').percent:.1f}% used"
-                )
-                self.chat_history.add_message("Orby", sys_info)
-                self.input_widget.text = ""
-                return
-            elif prompt.lower() in ['clear', 'cls']:
-                # Clear the chat history
-                for child in self.chat_history.children:
-                    if child != self.thinking_container:
-                        child.remove()
-                self.chat_history.messages.clear()
-                self.chat_history.add_message("Orby", "Chat history cleared. How can I help you?")
-                self.input_widget.text = ""
-                return
-            elif prompt.lower() in ['quit', 'exit', 'q']:
-                self.exit()
-                return
-            elif prompt.lower().startswith('temperature '):
-                try:
-                    temp_str = prompt.lower().split(' ', 1)[1]
-                    temp_value = float(temp_str)
-                    if 0.0 <= temp_value <= 1.0:
-                        self.config.temperature = temp_value
-                        # Update the config manager as well
-                        config_manager = ConfigManager()
-                        updated_config = config_manager.get_current_config()
-                        updated_config.temperature = temp_value
-                        config_manager.save_config(updated_config)
-                        
-                        self.chat_history.add_message("Orby", f"**Temperature set to:** {temp_value}")
-                    else:
-                        self.chat_history.add_message("Orby", "**Temperature must be between 0.0 and 1.0**")
-                except (ValueError, IndexError):
-                    self.chat_history.add_message("Orby", "**Invalid temperature command. Use: `temperature <value>`**")
-                self.input_widget.text = ""
-                return
-            
-            # Check for special execution commands
             prompt_lower = prompt.lower()
-            if prompt_lower.startswith('execute:') or prompt_lower.startswith('run:'):
-                if self.config.enable_terminal_execution:
-                    command = prompt[8:].strip()  # Remove 'execute:' or 'run:'
-                    if TerminalExecutor.safe_command(command):
-                        self.chat_history.add_message("You", f"**EXECUTING:** {command}")
-                        result = TerminalExecutor.execute_command(command)
-                        if result['success']:
-                            response = f"**Command succeeded:**\n```\n{result['stdout']}\n```"
-                            if result['stderr']:
-                                response += f"\n**Errors:**\n```\n{result['stderr']}\n```"
-                        else:
-                            response = f"**Command failed:**\n```\n{result['stderr']}\n```"
-                        self.chat_history.add_message("Orby", response)
-                    else:
-                        self.chat_history.add_message("Orby", "** Unsafe command blocked:** " + command)
-                else:
-                    self.chat_history.add_message("Orby", "**Terminal execution is disabled in configuration.**")
-                self.input_widget.text = ""
-                return
-            elif prompt_lower.startswith('search:') or prompt_lower.startswith('find:'):
-                if self.config.enable_online_search:
-                    query = prompt[7:].strip()  # Remove 'search:' or 'find:'
-                    self.chat_history.add_message("You", f"**SEARCHING:** {query}")
-                    
-                    # Create web searcher instance
-                    web_searcher = WebSearcher()
-                    results = web_searcher.search(query)
-                    
-                    if results:
-                        response = f"**Search results for '{query}':**\n\n"
-                        for i, result in enumerate(results[:3]):  # Show top 3 results
-                            response += f"{i+1}. **{result['title']}**\n   {result['snippet'][:200]}...\n\n"
-                    else:
-                        response = f"**No search results found for:** {query}"
-                    
-                    self.chat_history.add_message("Orby", response)
-                else:
-                    self.chat_history.add_message("Orby", "**Online search is disabled in configuration.**")
+            handler, arg = self._match_command(prompt, prompt_lower)
+            if handler is not None:
+                handler(arg)
                 self.input_widget.text = ""
                 return
             
@@ -514,16 +602,133 @@ class OrbyTUI(App):
             
             # Show thinking indicator
             self.thinking_container.visible = True
+            self.thinking_indicator.start()
             self.chat_history.scroll_end(animate=True, speed=50)
             
-            # Process with AI in a separate call to prevent UI blocking
+            # Process with AI on a worker thread to prevent UI blocking
             self._process_ai_response(prompt)
             
             # Clear input
             self.input_widget.text = ""
     
+    def _match_command(self, prompt: str, prompt_lower: str):
+        """Return (handler, argument) for a built-in command, or (None, None)."""
+        handler = self._exact_commands.get(prompt_lower)
+        if handler is not None:
+            return handler, ""
+        for prefix, prefix_handler in self._prefix_commands:
+            if prompt_lower.startswith(prefix):
+                return prefix_handler, prompt[len(prefix):].strip()
+        return None, None
+    
+    def _cmd_help(self, arg: str):
+        self.chat_history.add_message("Orby", _HELP_TEMPLATE.format(**vars(self.config)))
+    
+    def _cmd_models(self, arg: str):
+        try:
+            models = self.llm.list_models()
+            models_list = "\n".join([f"- {model}" for model in models])
+            self.chat_history.add_message("Orby", f"**Available models:**\n{models_list}")
+        except Exception as e:
+            self.chat_history.add_message("Orby", f"**Error listing models:** {str(e)}")
+    
+    def _cmd_config(self, arg: str):
+        self.chat_history.add_message("Orby", _CONFIG_TEMPLATE.format(**vars(self.config)))
+    
+    def _cmd_system(self, arg: str):
+        if self._metrics_pool is None:
+            self._metrics_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="orby-metrics")
+        self._metrics_pool.submit(self._report_system_info)
+    
+    def _report_system_info(self):
+        """Report system usage. Runs on the metrics thread, which keeps the CPU
+        baseline from one report to the next."""
+        from orby_coder.utils.advanced import get_system_info
+        try:
+            info = get_system_info()
+        except ImportError as e:
+            self.call_from_thread(self.chat_history.add_message, "Orby", f"**Error:** {e}")
+            return
+        
+        sys_info = (
+            f"**System Information:**\n"
+            f"- CPU Usage: {info['cpu_percent']}%\n"
+            f"- Memory: {info['memory_percent']}% used ({info['memory_available'] // (1024**3)}GB free)\n"
+            f"- Disk: {info['disk_percent']:.1f}% used"
+        )
+        self.call_from_thread(self.chat_history.add_message, "Orby", sys_info)
+    
+    def _cmd_clear(self, arg: str):
+        # Clear the chat history; the greeting is laid out in the same pass
+        with self.batch_update():
+            self.chat_history.clear_messages()
+            self.chat_history.add_message("Orby", "Chat history cleared. How can I help you?")
+    
+    def _cmd_quit(self, arg: str):
+        self.exit()
+    
+    def _cmd_temperature(self, arg: str):
+        try:
+            temp_value = float(arg)
+            if 0.0 <= temp_value <= 1.0:
+                # Persist only the temperature: the app's config may carry a --model
+                # override that must not end up in the file
+                if temp_value != self.config.temperature:
+                    self.config.temperature = temp_value
+                    saved = self._config_manager.load_config()
+                    saved.temperature = temp_value
+                    self._config_manager.save_config(saved)
+                
+                self.chat_history.add_message("Orby", f"**Temperature set to:** {temp_value}")
+            else:
+                self.chat_history.add_message("Orby", "**Temperature must be between 0.0 and 1.0**")
+        except ValueError:
+            self.chat_history.add_message("Orby", "**Invalid temperature command. Use: `temperature <value>`**")
+    
+    def _cmd_execute(self, command: str):
+        if not self.config.enable_terminal_execution:
+            self.chat_history.add_message("Orby", "**Terminal execution is disabled in configuration.**")
+            return
+        from orby_coder.utils.advanced import TerminalExecutor
+        if TerminalExecutor.safe_command(command):
+            self.chat_history.add_message("You", f"**EXECUTING:** {command}")
+            result = TerminalExecutor.execute_command(command)
+            if result['success']:
+                response = f"**Command succeeded:**\n```\n{result['stdout']}\n```"
+                if result['stderr']:
+                    response += f"\n**Errors:**\n```\n{result['stderr']}\n```"
+            else:
+                response = f"**Command failed:**\n```\n{result['stderr']}\n```"
+            self.chat_history.add_message("Orby", response)
+        else:
+            self.chat_history.add_message("Orby", "** Unsafe command blocked:** " + command)
+    
+    def _cmd_search(self, query: str):
+        if not self.config.enable_online_search:
+            self.chat_history.add_message("Orby", "**Online search is disabled in configuration.**")
+            return
+        self.chat_history.add_message("You", f"**SEARCHING:** {query}")
+        self._search_web(query)
+    
+    @work(thread=True, group="web-search")
+    def _search_web(self, query: str):
+        """Run a web search on a worker thread; the request can take seconds."""
+        results = self.web_searcher.search(query)
+        
+        if results:
+            response = f"**Search results for '{query}':**\n\n"
+            for i, result in enumerate(results[:3]):  # Show top 3 results
+                response += f"{i+1}. **{result['title']}**\n   {result['snippet'][:200]}...\n\n"
+        else:
+            response = f"**No search results found for:** {query}"
+        
+        self.call_from_thread(self.chat_history.add_message, "Orby", response)
+    
+    @work(thread=True, exclusive=True)
     def _process_ai_response(self, prompt: str):
-        """Process AI response."""
+        """Process AI response. Runs on a worker thread; widgets are only touched via call_from_thread."""
+        message = None
+        parts = []
         try:
             # Process with AI
             messages = [
@@ -531,34 +736,58 @@ class OrbyTUI(App):
                 {"role": "user", "content": prompt}
             ]
             
-            # Get response from LLM with context enabled
-            response = self.llm.chat_complete(messages, enable_context=True)
-            
-            # Add AI response to history
-            self.chat_history.add_message("Orby", response)
-            
-            # If response contains code, display it in the code view
-            if "```" in response:
-                # Simple extraction of first code block
-                parts = response.split("```")
-                if len(parts) > 1:
-                    code_block = parts[1].split('\n', 1)[-1]  # Remove language specifier line
-                    if '\n' in code_block:
-                        code_block = code_block.rsplit('\n', 1)[0]  # Remove closing ```
-                    self.code_view.update_code(code_block)
-                    self.code_view.display = True  # Show code panel if there's code
+            # Stream the response from the LLM with context enabled into one message
+            # that is re-rendered at most every _STREAM_UPDATE_SECONDS
+            last_update = 0.0
+            for chunk in self.llm.stream_chat(messages, enable_context=True):
+                if message is None:
+                    message = self.call_from_thread(self.chat_history.start_streaming_message, "Orby")
+                parts.append(chunk)
+                now = time.monotonic()
+                if now - last_update >= _STREAM_UPDATE_SECONDS:
+                    self.call_from_thread(self._update_ai_message, message, "".join(parts))
+                    last_update = now
+            response = "".join(parts)
+            if message is None:
+                message = self.call_from_thread(self.chat_history.start_streaming_message, "Orby")
+            self.call_from_thread(self._show_ai_response, message, response)
         
         except Exception as e:
-            self.chat_history.add_message("Orby", f"**Error:** {str(e)}")
+            if message is not None:
+                self.call_from_thread(self.chat_history.finish_streaming_message, message, "".join(parts))
+            self.call_from_thread(self.chat_history.add_message, "Orby", f"**Error:** {str(e)}")
         finally:
-            # Hide thinking indicator
-            self.thinking_container.visible = False
-            self.chat_history.scroll_end(animate=True, speed=50)
+            self.call_from_thread(self._hide_thinking)
+    
+    def _update_ai_message(self, message: MessageContainer, text: str):
+        """Show the response received so far, following it down the history."""
+        message.update_content(text)
+        self.chat_history.request_scroll_end()
+    
+    def _show_ai_response(self, message: MessageContainer, response: str):
+        """Finish the streamed AI response and show its code, if any."""
+        self.chat_history.finish_streaming_message(message, response)
+        
+        # If response contains code, display its first block in the code view
+        code_block = extract_code_block(response)
+        if code_block is not None:
+            self.code_view.update_code(code_block)
+            self.code_view.display = True  # Show code panel if there's code
+    
+    def _hide_thinking(self):
+        """Hide the thinking indicator once a response has arrived."""
+        self.thinking_container.visible = False
+        self.thinking_indicator.stop()
+        self.chat_history.scroll_end(animate=True, speed=50)
     
     def action_quit(self) -> None:
         """Quit the application."""
         self.exit()
     
+    def on_unmount(self) -> None:
+        if self._metrics_pool is not None:
+            self._metrics_pool.shutdown(wait=False, cancel_futures=True)
+    
     def action_toggle_code_view(self) -> None:
         """Toggle the code view panel."""
         self.code_view.display = not self.code_view.display
@@ -575,11 +804,11 @@ def ui_command(
     model: Optional[str] = typer.Option(None, "--model", "-m", help="Model to use for inference")
 ):
     """Launch the Textual-based interactive UI."""
-    config_manager = ConfigManager()
+    config_manager = ConfigManager.instance()
     config = config_manager.get_current_config()
     
     if model:
         config.default_model = model
     
-    app = OrbyTUI(config)
+    app = OrbyTUI(config, config_manager)
     app.run()
\ No newline at end of file
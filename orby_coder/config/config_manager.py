@@ -3,17 +3,23 @@ import json
 import os
 from pathlib import Path
 from typing import Dict, Any, Optional
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, field, fields
+from functools import cached_property
 
 @dataclass
 class IDEIntegrationConfig:
     vscode_path: str = "/usr/bin/code"
     cursor_path: str = "/usr/bin/cursor"
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the JSON-serializable form of this config."""
+        return {"vscode_path": self.vscode_path, "cursor_path": self.cursor_path}
 
 @dataclass
 class ModelConfig:
     backend: str = "ollama"  # "ollama" or "lmstudio"
     default_model: str = "llama3.2"
+    draft_model: Optional[str] = None  # smaller, faster model for explaining/analyzing short files
     lmstudio_base_url: str = "http://localhost:1234/v1"
     ollama_base_url: str = "http://localhost:11434/api"
     system_prompt: str = """You are Orby, an AI coding assistant developed by Jaskirat Singh, designed to help users with software development tasks. Your capabilities mirror those of the Gemini CLI.
@@ -42,17 +48,57 @@ Remember: You're not just providing information; you're helping users become bet
     max_tokens: Optional[int] = None
     enable_online_search: bool = True
     enable_terminal_execution: bool = True
+    semantic_cache_threshold: Optional[float] = None  # word-order-aware similarity above which a paraphrased prompt reuses a cached response; None disables it
+    ollama_raw_stream: bool = False  # stream Ollama replies over plain HTTP instead of through the ollama SDK
     ide_integration: IDEIntegrationConfig = field(default_factory=IDEIntegrationConfig)
+    
+    @cached_property
+    def code_system_prompt(self) -> str:
+        """System prompt used for code generation."""
+        return f"{self.system_prompt} You are an expert software developer. When providing code, always format it with proper syntax highlighting and include helpful comments."
+    
+    @cached_property
+    def explain_system_prompt(self) -> str:
+        """System prompt used to explain generated code."""
+        return f"{self.system_prompt} Explain the following code in a clear and concise manner, focusing on how it works and what it does."
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the JSON-serializable form of this config without asdict()'s deep copy."""
+        data = {f.name: getattr(self, f.name) for f in fields(self)}
+        data['ide_integration'] = self.ide_integration.to_dict()
+        return data
+    
+    def clear_cached_prompts(self):
+        """Drop the derived prompts so they are rebuilt from the current system_prompt."""
+        self.__dict__.pop('code_system_prompt', None)
+        self.__dict__.pop('explain_system_prompt', None)
 
 class ConfigManager:
     """Manages configuration settings for Orby Coder."""
     
+    _instance: Optional["ConfigManager"] = None
+    
     def __init__(self):
         self.config_dir = Path.home() / ".orby"
         self.config_file = self.config_dir / "config.json"
+        self._mtime_ns: Optional[int] = None  # mtime of the file model_config was read from
         self._ensure_config_dir()
         self.model_config = self.load_config()
     
+    @classmethod
+    def instance(cls) -> "ConfigManager":
+        """Return the process-wide ConfigManager, creating it on first use."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+    
+    def _config_mtime_ns(self) -> Optional[int]:
+        """Return the config file's mtime in nanoseconds, or None if it is missing."""
+        try:
+            return self.config_file.stat().st_mtime_ns
+        except OSError:
+            return None
+    
     def _ensure_config_dir(self):
         """Ensure the config directory exists."""
         self.config_dir.mkdir(exist_ok=True)
@@ -61,29 +107,32 @@ class ConfigManager:
         """Load configuration from file, or create default if not exists."""
         if self.config_file.exists():
             try:
-                with open(self.config_file, 'r') as f:
-                    data = json.load(f)
-                    # Handle potential missing fields in old config files
-                    ide_config_data = data.get('ide_integration', {})
-                    ide_config = IDEIntegrationConfig(
-                        vscode_path=ide_config_data.get('vscode_path', '/usr/bin/code'),
-                        cursor_path=ide_config_data.get('cursor_path', '/usr/bin/cursor')
-                    )
-                    
-                    config_dict = {
-                        'backend': data.get('backend', 'ollama'),
-                        'default_model': data.get('default_model', 'llama3.2'),
-                        'lmstudio_base_url': data.get('lmstudio_base_url', 'http://localhost:1234/v1'),
-                        'ollama_base_url': data.get('ollama_base_url', 'http://localhost:11434/api'),
-                        'system_prompt': data.get('system_prompt', 'You are an expert software developer. Provide helpful and accurate coding assistance.'),
-                        'temperature': data.get('temperature', 0.7),
-                        'max_tokens': data.get('max_tokens'),
-                        'enable_online_search': data.get('enable_online_search', True),
-                        'enable_terminal_execution': data.get('enable_terminal_execution', True),
-                        'ide_integration': ide_config
-                    }
-                    return ModelConfig(**config_dict)
-            except (json.JSONDecodeError, TypeError, KeyError) as e:
+                self._mtime_ns = self._config_mtime_ns()
+                data = json.loads(self.config_file.read_text(encoding='utf-8'))
+                # Handle potential missing fields in old config files
+                ide_config_data = data.get('ide_integration', {})
+                ide_config = IDEIntegrationConfig(
+                    vscode_path=ide_config_data.get('vscode_path', '/usr/bin/code'),
+                    cursor_path=ide_config_data.get('cursor_path', '/usr/bin/cursor')
+                )
+                
+                config_dict = {
+                    'backend': data.get('backend', 'ollama'),
+                    'default_model': data.get('default_model', 'llama3.2'),
+                    'draft_model': data.get('draft_model'),
+                    'lmstudio_base_url': data.get('lmstudio_base_url', 'http://localhost:1234/v1'),
+                    'ollama_base_url': data.get('ollama_base_url', 'http://localhost:11434/api'),
+                    'system_prompt': data.get('system_prompt', 'You are an expert software developer. Provide helpful and accurate coding assistance.'),
+                    'temperature': data.get('temperature', 0.7),
+                    'max_tokens': data.get('max_tokens'),
+                    'enable_online_search': data.get('enable_online_search', True),
+                    'enable_terminal_execution': data.get('enable_terminal_execution', True),
+                    'semantic_cache_threshold': data.get('semantic_cache_threshold'),
+                    'ollama_raw_stream': data.get('ollama_raw_stream', False),
+                    'ide_integration': ide_config
+                }
+                return ModelConfig(**config_dict)
+            except (json.JSONDecodeError, UnicodeDecodeError, TypeError, KeyError) as e:
                 # If config is invalid, return defaults
                 print(f"Warning: Invalid config file, using defaults: {e}")
                 return ModelConfig()
@@ -95,11 +144,14 @@ class ConfigManager:
     
     def save_config(self, config: ModelConfig):
         """Save configuration to file."""
-        # Convert to dict but handle the nested dataclass
-        config_dict = asdict(config)
-        with open(self.config_file, 'w') as f:
-            json.dump(config_dict, f, indent=2)
+        config.clear_cached_prompts()
+        self.config_file.write_text(json.dumps(config.to_dict(), indent=2), encoding='utf-8')
+        # The file now matches `config`, so later reads can skip the disk
+        self.model_config = config
+        self._mtime_ns = self._config_mtime_ns()
     
     def get_current_config(self) -> ModelConfig:
-        """Get the current configuration."""
+        """Get the current configuration, re-reading the file only if it changed on disk."""
+        if self._config_mtime_ns() != self._mtime_ns:
+            self.model_config = self.load_config()
         return self.model_config
\ No newline at end of file
@@ -1,17 +1,210 @@
 """Core LLM integration for Orby Coder - Gemini CLI style tool usage."""
-import requests
+import asyncio
 import json
-from typing import Generator, Dict, Any, Optional, List
-from pathlib import Path
-import ollama
-from openai import OpenAI
+import re
+try:
+    import orjson  # optional, faster JSON
+except ImportError:
+    orjson = None
+from collections import OrderedDict
+from functools import cached_property, lru_cache
+from typing import AsyncGenerator, Callable, Generator, Dict, Any, Iterable, Iterator, Optional, List
+import httpx
+import importlib.util
 from orby_coder.config.config_manager import ModelConfig
 from orby_coder.core.tools import ShellTool, WebSearchTool, ReadFileTool
-from datetime import datetime
-import subprocess
 import os
-import platform
-from orby_coder.utils.advanced import WebSearcher, TerminalExecutor, ToolManager
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Connection pool for the OpenAI-compatible (LM Studio) clients. Idle connections are
+# kept for a minute, long enough to survive the pause between two prompts, instead of
+# httpx's 5 seconds. HTTP/2 needs the optional `h2` package and an https base URL.
+_OPENAI_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=40, max_connections=100, keepalive_expiry=60.0)
+# Same as the OpenAI SDK default: long reads for slow local generations
+_OPENAI_HTTP_TIMEOUT = httpx.Timeout(600.0, connect=5.0)
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+# Same idea for the Ollama clients
+_OLLAMA_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=16, max_connections=32, keepalive_expiry=60.0)
+# Plain HTTP calls (model listing, health checks, raw Ollama streams): keep a few
+# connections alive but never make a caller wait for a free one
+_SESSION_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=16, max_connections=None, keepalive_expiry=60.0)
+
+def _ollama_num_parallel() -> int:
+    """Requests the Ollama server runs at once, as set by OLLAMA_NUM_PARALLEL."""
+    try:
+        return max(1, int(os.getenv("OLLAMA_NUM_PARALLEL", "4")))
+    except ValueError:
+        return 4
+
+# Attempts made for an Ollama request that fails transiently, and the base of the
+# exponential backoff between them (LM Studio's OpenAI client retries by itself)
+_RETRY_ATTEMPTS = 3
+_RETRY_BASE_DELAY = 0.2
+_RETRYABLE_STATUS = frozenset({502, 503, 504})
+_END = object()
+
+def _is_retryable(error: Exception) -> bool:
+    """Whether `error` looks transient: a refused or dropped connection, a timeout or a gateway error."""
+    if isinstance(error, (ConnectionError, TimeoutError, httpx.TransportError)):
+        return True
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status in _RETRYABLE_STATUS
+
+def _with_retries(call: Callable[[], Any]) -> Any:
+    """Run `call`, retrying transient failures with jittered exponential backoff."""
+    for attempt in range(_RETRY_ATTEMPTS):
+        try:
+            return call()
+        except Exception as e:
+            if attempt == _RETRY_ATTEMPTS - 1 or not _is_retryable(e):
+                raise
+            time.sleep(_RETRY_BASE_DELAY * 2 ** attempt + random.uniform(0, _RETRY_BASE_DELAY))
+
+def _retrying_stream(open_stream: Callable[[], Iterable[str]]) -> Iterator[str]:
+    """Stream from `open_stream()`, retrying until the first piece arrives but never after."""
+    def start():
+        iterator = iter(open_stream())
+        return iterator, next(iterator, _END)
+    
+    iterator, first = _with_retries(start)
+    if first is _END:
+        return
+    yield first
+    yield from iterator
+
+# The sync backend clients are shared by every provider with the same URL, so a
+# provider rebuilt for a reloaded config keeps the warm connection pool. The SDKs
+# are imported here; each pulls in a large dependency tree the other backend never needs.
+@lru_cache(maxsize=8)
+def _openai_client(base_url: str):
+    from openai import OpenAI
+    return OpenAI(
+        base_url=base_url,
+        api_key="dummy",
+        http_client=httpx.Client(http2=_HTTP2_AVAILABLE, limits=_OPENAI_HTTP_LIMITS, timeout=_OPENAI_HTTP_TIMEOUT)
+    )
+
+@lru_cache(maxsize=8)
+def _ollama_client(host: Optional[str]):
+    import ollama
+    return ollama.Client(host=host, limits=_OLLAMA_HTTP_LIMITS)
+
+def _ollama_chunk_text(chunk) -> Optional[str]:
+    """Content of one streamed Ollama chunk.
+    
+    ollama>=0.4 yields ChatResponse models, whose item access re-checks the field on
+    every lookup; attribute access avoids that. Older versions yield plain dicts.
+    """
+    try:
+        return chunk.message.content
+    except AttributeError:
+        return chunk.get('message', {}).get('content')
+
+def _ollama_host(base_url: str) -> Optional[str]:
+    """Host for the ollama clients from the configured API URL.
+    
+    The default URL maps to None so the library still honours OLLAMA_HOST.
+    """
+    if base_url == ModelConfig.ollama_base_url:
+        return None
+    url = base_url.rstrip("/")
+    return url[:-len("/api")] if url.endswith("/api") else url
+
+def _dumps_compact(obj: Any) -> str:
+    """Serialize `obj` as JSON without whitespace or escaped non-ASCII, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+def _loads(data: bytes) -> Any:
+    """Parse a JSON response body, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Seconds a model listing / connection check is reused before asking the backend again
+_MODELS_TTL = 30.0
+_CONNECTION_TTL = 10.0
+# Recent web search results kept for repeated prompts
+_SEARCH_CACHE_SIZE = 64
+_SEARCH_CACHE_TTL = 60.0
+# Requests achat_many keeps in flight against LM Studio unless told otherwise
+_BATCH_CONCURRENCY = 8
+# Backend URLs LocalLLMProvider.warm_up already connected to in this process
+_warmed_up_urls: set = set()
+_warm_up_lock = threading.Lock()
+
+# Prompt triggers for the tools run by LocalLLMProvider._enhanced_process. The
+# indicators are listed first and in priority order; the text after them is the
+# command or query.
+_COMMAND_INDICATORS = ('execute:', 'run:', 'terminal:', 'command:')
+_TERMINAL_TRIGGERS = _COMMAND_INDICATORS + (
+    'can you run', 'please run', 'try running',
+    'run this command', 'execute this', 'terminal command'
+)
+_SEARCH_INDICATORS = ('search:', 'find:', 'lookup:', 'google:', 'web:')
+_SEARCH_TRIGGERS = _SEARCH_INDICATORS + (
+    'can you search', 'please search', 'look up',
+    'what is', 'who is', 'when was', 'how does', 'why is',
+    'current status', 'latest news', 'recent updates'
+)
+# Matches at every offset (the lookahead consumes nothing), so overlapping
+# triggers such as "can you run" and "run:" are all reported. Case-insensitive,
+# so prompts are scanned as typed rather than through a lowercased copy.
+_TRIGGER_RE = re.compile(
+    "(?=(" + "|".join(re.escape(t) for t in sorted(set(_TERMINAL_TRIGGERS + _SEARCH_TRIGGERS), key=len, reverse=True)) + "))",
+    re.IGNORECASE
+)
+
+# System prompt additions describing the tools whose results are in the context
+_TOOL_HEADER = (
+    "\n\n[TOOL USAGE INSTRUCTIONS]\n"
+    "You have access to the following tools that can be used when appropriate:\n"
+)
+_TERMINAL_INSTRUCTIONS = (
+    "TERMINAL EXECUTION: You can execute commands to verify code, run tests, or gather system information.\n"
+    "Usage: Prefix your response with TERMINAL: followed by the command to execute.\n"
+)
+_SEARCH_INSTRUCTIONS = (
+    "WEB SEARCH: You can search the web for current information or topics you're uncertain about.\n"
+    "Usage: Prefix your response with SEARCH: followed by your search query.\n"
+)
+
+@lru_cache(maxsize=4)
+def _tool_instructions_for(terminal: bool, search: bool) -> str:
+    """Instruction block for the tools a request used; one string per combination."""
+    parts = [_TOOL_HEADER]
+    if terminal:
+        parts.append(_TERMINAL_INSTRUCTIONS)
+    if search:
+        parts.append(_SEARCH_INSTRUCTIONS)
+    return "".join(parts)
+
+# Prompts that mention a source file or ask to read one
+_FILE_EXTENSIONS = ('.py', '.js', '.ts', '.java', '.cpp', '.c', '.h', '.hpp', '.cs', '.go', '.rs', '.swift')
+_FILE_TRIGGERS = ('file:', 'read file', 'open file', 'contents of', 'show me the file')
+# Extensions only count at the end of a name ("main.c", not ".com" or ".cs" for ".c")
+_FILE_REFERENCE_RE = re.compile(
+    r"\w(?:%s)(?!\w)|%s" % (
+        "|".join(re.escape(ext) for ext in _FILE_EXTENSIONS),
+        "|".join(re.escape(t) for t in _FILE_TRIGGERS),
+    ),
+    re.IGNORECASE
+)
+
+def _scan_triggers(text: str) -> Dict[str, int]:
+    """Map each tool trigger in `text` to the end offset of its first occurrence."""
+    found = {}
+    for match in _TRIGGER_RE.finditer(text):
+        trigger = match.group(1).lower()
+        if trigger not in found:
+            found[trigger] = match.end(1)
+    return found
 
 class LocalLLMProvider:
     """Handles communication with local LLM backends."""
@@ -19,119 +212,170 @@ class LocalLLMProvider:
     def __init__(self, config: ModelConfig):
         self.config = config
         self.client = None
+        self.ollama_client = None
+        self._async_client = None  # created by the first async request
+        # (monotonic time, _cache_key(), result) of the last list_models/test_connection
+        self._models_cache: Optional[tuple] = None
+        self._connection_cache: Optional[tuple] = None
+        self._search_cache: "OrderedDict[str, tuple]" = OrderedDict()  # query -> (monotonic time, result)
+        # Searches may run on tool threads, and async requests can overlap
+        self._search_lock = threading.Lock()
+        self._tool_pool: Optional[ThreadPoolExecutor] = None
+        # backend name -> (chat, stream) implementations
+        self._backends = {
+            "ollama": (self._ollama_chat, self._ollama_stream),
+            "lmstudio": (self._lmstudio_chat, self._lmstudio_stream),
+        }
         
         if config.backend == "lmstudio":
             # LM Studio uses OpenAI-compatible API
-            self.client = OpenAI(base_url=config.lmstudio_base_url, api_key="dummy")
-        # For Ollama, we use the ollama library directly
+            self.client = _openai_client(config.lmstudio_base_url)
+        elif config.backend == "ollama":
+            self.ollama_client = _ollama_client(_ollama_host(config.ollama_base_url))
+    
+    @cached_property
+    def session(self) -> httpx.Client:
+        """Keep-alive pool for the plain HTTP calls, created on first use (building one takes ~20ms)."""
+        return httpx.Client(limits=_SESSION_HTTP_LIMITS, follow_redirects=True)
+    
+    def warm_up(self):
+        """Open a keep-alive connection to the backend in the background.
+        
+        Commands call this just before sending their first prompt, so that request
+        skips the connect. Each backend URL is only warmed up once per process.
+        """
+        url = self.config.lmstudio_base_url if self.client is not None else self.config.ollama_base_url
+        with _warm_up_lock:
+            if url in _warmed_up_urls:
+                return
+            _warmed_up_urls.add(url)
+        threading.Thread(target=self._warm_up, name="orby-warm-up", daemon=True).start()
+    
+    def _warm_up(self):
+        """Request the backend's model list; the response itself is discarded."""
+        try:
+            if self.client is not None:
+                self.client.with_options(timeout=2.0, max_retries=0).models.list()
+            elif self.ollama_client is not None:
+                self.ollama_client.list()
+        except Exception:
+            pass
+    
+    def close(self):
+        """Release this provider's pooled HTTP connections.
+        
+        The sync backend clients are shared per URL by every provider and stay open.
+        """
+        if "session" in self.__dict__:
+            self.session.close()
+        if self._tool_pool is not None:
+            self._tool_pool.shutdown(wait=False)
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
     
     def _prepare_messages(self, messages: list, context: Optional[Dict] = None) -> list:
         """Prepare messages for the LLM, ensuring proper format and adding context if needed."""
-        # Add context to messages if provided
-        prepared = []
-        for msg in messages:
-            if isinstance(msg, dict) and 'role' in msg and 'content' in msg:
-                prepared.append(msg)
-            else:
-                # Assume it's user content if not properly formatted
-                prepared.append({"role": "user", "content": str(msg)})
+        if all(isinstance(msg, dict) and 'role' in msg and 'content' in msg for msg in messages):
+            # Already well-formed: the list is only copied if context has to be inserted
+            prepared = messages
+        else:
+            # Assume it's user content if not properly formatted
+            prepared = [
+                msg if isinstance(msg, dict) and 'role' in msg and 'content' in msg
+                else {"role": "user", "content": str(msg)}
+                for msg in messages
+            ]
         
-        # If we have context, add it to the conversation
+        # If we have context, add it after the first message of the conversation
         if context:
-            # Add context to the beginning of the conversation
-            context_msg = f"Additional context:\n{json.dumps(context, indent=2)}"
-            prepared.insert(1, {"role": "user", "content": context_msg})
+            context_msg = {"role": "user", "content": f"Additional context:\n{_dumps_compact(context)}"}
+            prepared = [*prepared[:1], context_msg, *prepared[1:]]
         
         return prepared
     
     def _enhanced_process(self, user_prompt: str) -> dict:
         """Process user prompt for special commands and context - Gemini CLI style tool usage."""
-        context = {}
+        # Tool name -> (callable, argument); run once every tool has been detected
+        tasks = {}
         
-        # Use new tools implementation for enhanced tool processing
-        user_prompt_lower = user_prompt.lower()
+        # Use new tools implementation for enhanced tool processing;
+        # one pass over the prompt finds every trigger of every tool
+        found = _scan_triggers(user_prompt)
         
         # Terminal execution tool - Gemini CLI style detection
-        if self.config.enable_terminal_execution:
-            terminal_triggers = [
-                'execute:', 'run:', 'terminal:', 'command:', 
-                'can you run', 'please run', 'try running',
-                'run this command', 'execute this', 'terminal command'
-            ]
-            
-            if any(trigger in user_prompt_lower for trigger in terminal_triggers):
-                # Extract command using regex-like approach
-                command_indicators = ['execute:', 'run:', 'terminal:', 'command:']
-                for indicator in command_indicators:
-                    if indicator in user_prompt_lower:
-                        command = user_prompt.split(indicator, 1)[1].strip()
-                        if command:
-                            # Use ShellTool to execute command
-                            shell_tool = ShellTool()
-                            validation_result = shell_tool.validate_params({"command": command})
-                            if not validation_result:  # No validation error
-                                # Check if confirmation is needed
-                                confirmation_needed = shell_tool.should_confirm_execute({"command": command})
-                                if confirmation_needed:
-                                    # In a real implementation, this would prompt user
-                                    # For now, we'll proceed with execution
-                                    pass
-                                
-                                # Execute the tool
-                                result = shell_tool.execute({"command": command})
-                                context['terminal_execution'] = result
-                        break
+        if self.config.enable_terminal_execution and any(t in found for t in _TERMINAL_TRIGGERS):
+            # The command follows the first explicit indicator, in priority order
+            indicator = next((i for i in _COMMAND_INDICATORS if i in found), None)
+            if indicator is not None:
+                command = user_prompt[found[indicator]:].strip()
+                if command:
+                    # Use ShellTool to execute command
+                    shell_tool = ShellTool()
+                    validation_result = shell_tool.validate_params({"command": command})
+                    if not validation_result:  # No validation error
+                        # Check if confirmation is needed
+                        confirmation_needed = shell_tool.should_confirm_execute({"command": command})
+                        if confirmation_needed:
+                            # In a real implementation, this would prompt user
+                            # For now, we'll proceed with execution
+                            pass
+                        
+                        # Execute the tool
+                        tasks['terminal_execution'] = (shell_tool.execute, {"command": command})
         
         # Web search tool - Gemini CLI style detection
-        if self.config.enable_online_search:
-            search_triggers = [
-                'search:', 'find:', 'lookup:', 'google:', 'web:',
-                'can you search', 'please search', 'look up',
-                'what is', 'who is', 'when was', 'how does', 'why is',
-                'current status', 'latest news', 'recent updates'
-            ]
+        if self.config.enable_online_search and any(t in found for t in _SEARCH_TRIGGERS):
+            # Search for the text after an explicit indicator, or the whole prompt
+            indicator = next((i for i in _SEARCH_INDICATORS if i in found), None)
+            search_query = user_prompt[found[indicator]:].strip() if indicator is not None else user_prompt
             
-            if any(trigger in user_prompt_lower for trigger in search_triggers):
-                # Extract search query
-                search_indicators = ['search:', 'find:', 'lookup:', 'google:', 'web:']
-                search_query = user_prompt
-                
-                for indicator in search_indicators:
-                    if indicator in user_prompt_lower:
-                        search_query = user_prompt.split(indicator, 1)[1].strip()
-                        break
-                
-                # If no explicit indicator, use the whole query for general search terms
-                if search_query == user_prompt:
-                    # Check for general knowledge questions
-                    question_indicators = [
-                        'what is', 'who is', 'when was', 'how does', 'why is',
-                        'current', 'latest', 'recent', 'news', 'status'
-                    ]
-                    for q_indicator in question_indicators:
-                        if q_indicator in user_prompt_lower:
-                            search_query = user_prompt
-                            break
-                
-                if search_query:
-                    # Use WebSearchTool to perform search
-                    web_search_tool = WebSearchTool()
-                    result = web_search_tool.execute({"query": search_query})
-                    context['web_search'] = result
+            if search_query:
+                tasks['web_search'] = (self._web_search, search_query)
         
         # File system tool - check if user is asking about specific files
-        file_extensions = ['.py', '.js', '.ts', '.java', '.cpp', '.c', '.h', '.hpp', '.cs', '.go', '.rs', '.swift']
-        file_triggers = ['file:', 'read file', 'open file', 'contents of', 'show me the file']
-        
-        if (any(ext in user_prompt_lower for ext in file_extensions) or 
-            any(trigger in user_prompt_lower for trigger in file_triggers)):
+        if _FILE_REFERENCE_RE.search(user_prompt):
             # This would be implemented for file reading capabilities using ReadFileTool
             pass
         
-        return context
+        if len(tasks) < 2:
+            return {name: fn(arg) for name, (fn, arg) in tasks.items()}
+        # A shell command and a web search wait on different things; run them side by side
+        futures = {name: self._tool_executor().submit(fn, arg) for name, (fn, arg) in tasks.items()}
+        return {name: future.result() for name, future in futures.items()}
     
-    def chat_complete(self, messages: list, model: Optional[str] = None, enable_context: bool = True) -> str:
-        """Get a chat completion from the configured backend with enhanced features."""
+    def _tool_executor(self) -> ThreadPoolExecutor:
+        """Return the thread pool tools run on, creating it on first use."""
+        if self._tool_pool is None:
+            self._tool_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="orby-tool")
+        return self._tool_pool
+    
+    def _web_search(self, query: str) -> dict:
+        """Run WebSearchTool for `query`, reusing a result from the last _SEARCH_CACHE_TTL seconds.
+        
+        Retries and regenerations resend the same prompt; searches have no side effects,
+        so they are cached (shell commands are always run again).
+        """
+        now = time.monotonic()
+        with self._search_lock:
+            cached = self._search_cache.get(query)
+            if cached is not None and now - cached[0] < _SEARCH_CACHE_TTL:
+                self._search_cache.move_to_end(query)
+                return cached[1]
+        # Use WebSearchTool to perform search
+        result = WebSearchTool().execute({"query": query})
+        with self._search_lock:
+            self._search_cache[query] = (now, result)
+            self._search_cache.move_to_end(query)
+            if len(self._search_cache) > _SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)
+        return result
+    
+    def _build_request(self, messages: list, model: Optional[str], enable_context: bool):
+        """Return (model_name, prepared_messages) for a request; shared by the sync and async APIs."""
         model_name = model or self.config.default_model
         
         # Process first message for special commands if it's a user message
@@ -144,57 +388,207 @@ class LocalLLMProvider:
         
         # Add tool usage instructions to system prompt for better tool utilization
         if context:
-            tool_instructions = (
-                "\n\n[TOOL USAGE INSTRUCTIONS]\n"
-                "You have access to the following tools that can be used when appropriate:\n"
+            prepared_messages = self._inject_tool_instructions(prepared_messages, context)
+        
+        return model_name, prepared_messages
+    
+    def _inject_tool_instructions(self, prepared_messages: list, context: dict) -> list:
+        """Append usage instructions for the tools in `context` to the system message, adding one if needed.
+        
+        `prepared_messages` must be a list owned by the request; it is returned, or
+        replaced by a new list when a system message has to be prepended.
+        """
+        tool_instructions = _tool_instructions_for('terminal_execution' in context, 'web_search' in context)
+        
+        # Add tool instructions to the first system message or create one
+        index = next((i for i, msg in enumerate(prepared_messages) if msg.get('role') == 'system'), -1)
+        if index < 0:
+            system_msg = {"role": "system", "content": self.config.system_prompt + tool_instructions}
+            return [system_msg, *prepared_messages]
+        if isinstance(prepared_messages[index].get('content'), str):
+            # Replace rather than edit the dict, which may belong to the caller
+            msg = prepared_messages[index]
+            prepared_messages[index] = {**msg, "content": msg['content'] + tool_instructions}
+        return prepared_messages
+    
+    def _ollama_options(self) -> dict:
+        return {
+            "temperature": self.config.temperature,
+            "num_predict": self.config.max_tokens
+        }
+    
+    @staticmethod
+    def _ollama_error(e: Exception, model_name: str, action: str) -> RuntimeError:
+        """Translate an Ollama failure, pointing at `ollama pull` for missing models."""
+        error_msg = str(e)
+        if "not found" in error_msg.lower():
+            return RuntimeError(f"Model '{model_name}' not found. Please pull the model first with: ollama pull {model_name}")
+        return RuntimeError(f"Error {action} Ollama: {error_msg}")
+    
+    def _ollama_chat(self, prepared_messages: list, model_name: str) -> str:
+        try:
+            response = _with_retries(lambda: self.ollama_client.chat(
+                model=model_name,
+                messages=prepared_messages,
+                options=self._ollama_options()
+            ))
+            return response['message']['content']
+        except Exception as e:
+            raise self._ollama_error(e, model_name, "with")
+    
+    def _ollama_stream(self, prepared_messages: list, model_name: str) -> Generator[str, None, None]:
+        def open_stream():
+            if self.config.ollama_raw_stream:
+                return self._ollama_raw_stream({
+                    "model": model_name,
+                    "messages": prepared_messages,
+                    "options": self._ollama_options(),
+                    "stream": True
+                })
+            stream = self.ollama_client.chat(
+                model=model_name,
+                messages=prepared_messages,
+                options=self._ollama_options(),
+                stream=True
             )
-            
-            if 'terminal_execution' in context:
-                tool_instructions += (
-                    "TERMINAL EXECUTION: You can execute commands to verify code, run tests, or gather system information.\n"
-                    "Usage: Prefix your response with TERMINAL: followed by the command to execute.\n"
+            return filter(None, map(_ollama_chunk_text, stream))
+        
+        try:
+            yield from _retrying_stream(open_stream)
+        except Exception as e:
+            raise self._ollama_error(e, model_name, "streaming with")
+    
+    def _ollama_raw_stream(self, payload: dict) -> Generator[str, None, None]:
+        """POST `payload` to Ollama's /api/chat on the pooled session and parse the NDJSON reply."""
+        url = f"{self.config.ollama_base_url.rstrip('/')}/chat"
+        with self.session.stream("POST", url, json=payload, timeout=httpx.Timeout(None, connect=5.0)) as response:
+            if response.status_code in _RETRYABLE_STATUS:
+                response.raise_for_status()
+            if response.is_error:
+                try:
+                    error = _loads(response.read()).get("error")
+                except ValueError:
+                    error = None
+                raise RuntimeError(error or f"HTTP {response.status_code} from {url}")
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                data = _loads(line)
+                if "error" in data:
+                    raise RuntimeError(data["error"])
+                content = data.get("message", {}).get("content")
+                if content:
+                    yield content
+    
+    def _lmstudio_chat(self, prepared_messages: list, model_name: str) -> str:
+        try:
+            response = self.client.chat.completions.create(
+                model=model_name,
+                messages=prepared_messages,
+                temperature=self.config.temperature,
+                max_tokens=self.config.max_tokens
+            )
+            return response.choices[0].message.content
+        except Exception as e:
+            raise RuntimeError(f"Error with LM Studio: {str(e)}")
+    
+    def _lmstudio_stream(self, prepared_messages: list, model_name: str) -> Generator[str, None, None]:
+        try:
+            stream = self.client.chat.completions.create(
+                model=model_name,
+                messages=prepared_messages,
+                temperature=self.config.temperature,
+                max_tokens=self.config.max_tokens,
+                stream=True
+            )
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            raise RuntimeError(f"Error streaming with LM Studio: {str(e)}")
+    
+    def _backend(self) -> tuple:
+        """Return the (chat, stream) functions for the configured backend."""
+        try:
+            return self._backends[self.config.backend]
+        except KeyError:
+            raise ValueError(f"Unsupported backend: {self.config.backend}") from None
+    
+    def chat_complete(self, messages: list, model: Optional[str] = None, enable_context: bool = True) -> str:
+        """Get a chat completion from the configured backend with enhanced features."""
+        chat, _ = self._backend()
+        model_name, prepared_messages = self._build_request(messages, model, enable_context)
+        return chat(prepared_messages, model_name)
+    
+    @staticmethod
+    def _coalesce_chunks(chunks: Iterable[str], min_chunk_bytes: int) -> Generator[str, None, None]:
+        """Merge small streamed chunks until at least `min_chunk_bytes` characters or a newline."""
+        if min_chunk_bytes <= 0:
+            yield from chunks
+            return
+        pending = []
+        size = 0
+        for chunk in chunks:
+            pending.append(chunk)
+            size += len(chunk)
+            if size >= min_chunk_bytes or "\n" in chunk:
+                yield "".join(pending)
+                pending.clear()
+                size = 0
+        if pending:
+            yield "".join(pending)
+    
+    def stream_chat(self, messages: list, model: Optional[str] = None, enable_context: bool = True, min_chunk_bytes: int = 0) -> Generator[str, None, None]:
+        """Stream chat completions from the configured backend with enhanced features.
+        
+        With `min_chunk_bytes` > 0, backend chunks are merged so each yielded piece holds
+        at least that many characters (or ends a line), cutting per-chunk overhead for callers.
+        """
+        _, stream = self._backend()
+        model_name, prepared_messages = self._build_request(messages, model, enable_context)
+        yield from self._coalesce_chunks(stream(prepared_messages, model_name), min_chunk_bytes)
+    
+    def _get_async_client(self):
+        """Return the asyncio client for the configured backend, creating it on first use."""
+        if self._async_client is None:
+            if self.config.backend == "lmstudio":
+                from openai import AsyncOpenAI
+                self._async_client = AsyncOpenAI(
+                    base_url=self.config.lmstudio_base_url,
+                    api_key="dummy",
+                    http_client=httpx.AsyncClient(http2=_HTTP2_AVAILABLE, limits=_OPENAI_HTTP_LIMITS, timeout=_OPENAI_HTTP_TIMEOUT)
                 )
-            
-            if 'web_search' in context:
-                tool_instructions += (
-                    "WEB SEARCH: You can search the web for current information or topics you're uncertain about.\n"
-                    "Usage: Prefix your response with SEARCH: followed by your search query.\n"
+            elif self.config.backend == "ollama":
+                import ollama
+                self._async_client = ollama.AsyncClient(
+                    host=_ollama_host(self.config.ollama_base_url), limits=_OLLAMA_HTTP_LIMITS
                 )
-            
-            # Add tool instructions to the last system message or create one
-            system_message_found = False
-            for i, msg in enumerate(prepared_messages):
-                if msg.get('role') == 'system':
-                    if isinstance(msg.get('content'), str):
-                        prepared_messages[i]['content'] += tool_instructions
-                    system_message_found = True
-                    break
-            
-            # If no system message found, add one at the beginning
-            if not system_message_found:
-                prepared_messages.insert(0, {"role": "system", "content": self.config.system_prompt + tool_instructions})
+            else:
+                raise ValueError(f"Unsupported backend: {self.config.backend}")
+        return self._async_client
+    
+    async def achat_complete(self, messages: list, model: Optional[str] = None, enable_context: bool = True) -> str:
+        """Async version of `chat_complete`.
+        
+        Several requests can be awaited together with `asyncio.gather`; Ollama only runs
+        them in parallel when the server is started with OLLAMA_NUM_PARALLEL > 1.
+        """
+        model_name, prepared_messages = self._build_request(messages, model, enable_context)
+        client = self._get_async_client()
         
         if self.config.backend == "ollama":
             try:
-                response = ollama.chat(
+                response = await client.chat(
                     model=model_name,
                     messages=prepared_messages,
-                    options={
-                        "temperature": self.config.temperature,
-                        "num_predict": self.config.max_tokens
-                    }
+                    options=self._ollama_options()
                 )
                 return response['message']['content']
             except Exception as e:
-                error_msg = str(e)
-                if "not found" in error_msg.lower():
-                    raise RuntimeError(f"Model '{model_name}' not found. Please pull the model first with: ollama pull {model_name}")
-                else:
-                    raise RuntimeError(f"Error with Ollama: {error_msg}")
-                
-        elif self.config.backend == "lmstudio":
+                raise self._ollama_error(e, model_name, "with")
+        else:
             try:
-                response = self.client.chat.completions.create(
+                response = await client.chat.completions.create(
                     model=model_name,
                     messages=prepared_messages,
                     temperature=self.config.temperature,
@@ -203,96 +597,107 @@ class LocalLLMProvider:
                 return response.choices[0].message.content
             except Exception as e:
                 raise RuntimeError(f"Error with LM Studio: {str(e)}")
-        else:
-            raise ValueError(f"Unsupported backend: {self.config.backend}")
     
-    def stream_chat(self, messages: list, model: Optional[str] = None, enable_context: bool = True) -> Generator[str, None, None]:
-        """Stream chat completions from the configured backend with enhanced features."""
-        model_name = model or self.config.default_model
-        
-        # Process first message for special commands if it's a user message
-        context = {}
-        if enable_context and messages and messages[0].get('role') == 'user':
-            context = self._enhanced_process(messages[0].get('content', ''))
-        
-        # Enhance messages with tool usage context if needed
-        prepared_messages = self._prepare_messages(messages, context)
-        
-        # Add tool usage instructions to system prompt for better tool utilization
-        if context:
-            tool_instructions = (
-                "\n\n[TOOL USAGE INSTRUCTIONS]\n"
-                "You have access to the following tools that can be used when appropriate:\n"
-            )
-            
-            if 'terminal_execution' in context:
-                tool_instructions += (
-                    "TERMINAL EXECUTION: You can execute commands to verify code, run tests, or gather system information.\n"
-                    "Usage: Prefix your response with TERMINAL: followed by the command to execute.\n"
-                )
-            
-            if 'web_search' in context:
-                tool_instructions += (
-                    "WEB SEARCH: You can search the web for current information or topics you're uncertain about.\n"
-                    "Usage: Prefix your response with SEARCH: followed by your search query.\n"
-                )
-            
-            # Add tool instructions to the last system message or create one
-            system_message_found = False
-            for i, msg in enumerate(prepared_messages):
-                if msg.get('role') == 'system':
-                    if isinstance(msg.get('content'), str):
-                        prepared_messages[i]['content'] += tool_instructions
-                    system_message_found = True
-                    break
-            
-            # If no system message found, add one at the beginning
-            if not system_message_found:
-                prepared_messages.insert(0, {"role": "system", "content": self.config.system_prompt + tool_instructions})
+    async def astream_chat(self, messages: list, model: Optional[str] = None, enable_context: bool = True) -> AsyncGenerator[str, None]:
+        """Async version of `stream_chat`, yielding content chunks as they arrive."""
+        model_name, prepared_messages = self._build_request(messages, model, enable_context)
+        client = self._get_async_client()
         
         if self.config.backend == "ollama":
             try:
-                stream = ollama.chat(
+                stream = await client.chat(
                     model=model_name,
                     messages=prepared_messages,
-                    options={
-                        "temperature": self.config.temperature,
-                        "num_predict": self.config.max_tokens
-                    },
+                    options=self._ollama_options(),
                     stream=True
                 )
-                for chunk in stream:
-                    if 'message' in chunk and 'content' in chunk['message']:
-                        yield chunk['message']['content']
+                async for chunk in stream:
+                    content = _ollama_chunk_text(chunk)
+                    if content:
+                        yield content
             except Exception as e:
-                error_msg = str(e)
-                if "not found" in error_msg.lower():
-                    raise RuntimeError(f"Model '{model_name}' not found. Please pull the model first with: ollama pull {model_name}")
-                else:
-                    raise RuntimeError(f"Error streaming with Ollama: {error_msg}")
-                
-        elif self.config.backend == "lmstudio":
+                raise self._ollama_error(e, model_name, "streaming with")
+        else:
             try:
-                stream = self.client.chat.completions.create(
+                stream = await client.chat.completions.create(
                     model=model_name,
                     messages=prepared_messages,
                     temperature=self.config.temperature,
                     max_tokens=self.config.max_tokens,
                     stream=True
                 )
-                for chunk in stream:
+                async for chunk in stream:
                     if chunk.choices and chunk.choices[0].delta and chunk.choices[0].delta.content:
                         yield chunk.choices[0].delta.content
             except Exception as e:
                 raise RuntimeError(f"Error streaming with LM Studio: {str(e)}")
-        else:
-            raise ValueError(f"Unsupported backend: {self.config.backend}")
+    
+    async def achat_many(self, batches: List[list], model: Optional[str] = None, enable_context: bool = True,
+                         concurrency: Optional[int] = None) -> list:
+        """Run `achat_complete` for every message list in `batches` concurrently.
+        
+        Results come back in input order; a request that failed yields its exception
+        instead of a string. At most `concurrency` requests are in flight; by default
+        OLLAMA_NUM_PARALLEL (4 if unset) for Ollama, since the server queues anything
+        beyond that anyway, and _BATCH_CONCURRENCY for LM Studio.
+        """
+        if concurrency is None:
+            concurrency = _ollama_num_parallel() if self.config.backend == "ollama" else _BATCH_CONCURRENCY
+        limit = asyncio.Semaphore(max(1, concurrency))
+        
+        async def one(messages: list) -> str:
+            async with limit:
+                return await self.achat_complete(messages, model, enable_context)
+        
+        return await asyncio.gather(*(one(messages) for messages in batches), return_exceptions=True)
+    
+    def chat_complete_many(self, batches: List[list], model: Optional[str] = None, enable_context: bool = True,
+                           concurrency: Optional[int] = None) -> list:
+        """Blocking version of `achat_many`; must not be called from a running event loop."""
+        return asyncio.run(self._achat_many_isolated(batches, model, enable_context, concurrency))
+    
+    async def _achat_many_isolated(self, batches: List[list], model: Optional[str], enable_context: bool,
+                                   concurrency: Optional[int]) -> list:
+        # The async client is bound to the loop it was first used on, so this
+        # private loop gets its own and closes it before asyncio.run returns
+        saved, self._async_client = self._async_client, None
+        try:
+            return await self.achat_many(batches, model, enable_context, concurrency)
+        finally:
+            client, self._async_client = self._async_client, saved
+            if client is not None:
+                await client.close()
+    
+    def _cache_key(self) -> tuple:
+        """Settings that list_models/test_connection results depend on."""
+        return (self.config.backend, self.config.ollama_base_url, self.config.lmstudio_base_url,
+                self.config.default_model)
+    
+    def invalidate_caches(self):
+        """Forget cached model listings and connection checks."""
+        self._models_cache = None
+        self._connection_cache = None
     
     def list_models(self) -> list:
-        """List available models from the configured backend."""
+        """List available models from the configured backend.
+        
+        The result is reused for _MODELS_TTL seconds while the backend settings are unchanged.
+        """
+        key = self._cache_key()
+        now = time.monotonic()
+        if self._models_cache is not None:
+            cached_at, cached_key, models = self._models_cache
+            if cached_key == key and now - cached_at < _MODELS_TTL:
+                return list(models)
+        models = self._fetch_models()
+        self._models_cache = (now, key, models)
+        return list(models)
+    
+    def _fetch_models(self) -> list:
+        """Ask the configured backend for its models."""
         if self.config.backend == "ollama":
             try:
-                response = ollama.list()
+                response = self.ollama_client.list()
                 # Handle different response formats
                 if 'models' in response:
                     models = response['models']
@@ -319,9 +724,9 @@ class LocalLLMProvider:
         elif self.config.backend == "lmstudio":
             try:
                 # Try to get models from the /models endpoint (OpenAI-compatible)
-                response = requests.get(f"{self.config.lmstudio_base_url}/models", timeout=10)
+                response = self.session.get(f"{self.config.lmstudio_base_url}/models", timeout=10)
                 if response.status_code == 200:
-                    data = response.json()
+                    data = _loads(response.content)
                     # Handle different response formats
                     if 'data' in data:
                         models_data = data['data']
@@ -345,7 +750,7 @@ class LocalLLMProvider:
                 else:
                     # If /models endpoint doesn't exist, return default
                     return [self.config.default_model]
-            except requests.exceptions.RequestException:
+            except (httpx.HTTPError, httpx.InvalidURL):
                 # If request fails, return default model
                 return [self.config.default_model]
             except Exception as e:
@@ -357,17 +762,46 @@ class LocalLLMProvider:
             return [self.config.default_model]
     
     def test_connection(self) -> bool:
-        """Test connection to the configured backend."""
+        """Test connection to the configured backend.
+        
+        The result is reused for _CONNECTION_TTL seconds while the backend settings are unchanged.
+        """
+        key = self._cache_key()
+        now = time.monotonic()
+        if self._connection_cache is not None:
+            cached_at, cached_key, ok = self._connection_cache
+            if cached_key == key and now - cached_at < _CONNECTION_TTL:
+                return ok
+        ok = self._check_connection()
+        self._connection_cache = (now, key, ok)
+        return ok
+    
+    def _check_connection(self) -> bool:
+        """Probe the configured backend."""
         try:
             if self.config.backend == "ollama":
                 # Test if ollama is running by listing models
-                ollama.list()
+                self.ollama_client.list()
                 return True
             elif self.config.backend == "lmstudio":
                 # Test connection to LM Studio API
-                response = requests.get(f"{self.config.lmstudio_base_url}/models", timeout=5)
+                response = self.session.get(f"{self.config.lmstudio_base_url}/models", timeout=5)
                 return response.status_code == 200
             else:
                 return False
         except:
-            return False
\ No newline at end of file
+            return False
+
+
+_shared_llm: Optional[LocalLLMProvider] = None
+
+def get_llm(config: ModelConfig) -> LocalLLMProvider:
+    """Return the process-wide provider for `config`, creating it on first use.
+    
+    The provider keeps its backend clients (and their connection pools), so every
+    command and TUI request made with the same config reuses them.
+    """
+    global _shared_llm
+    if _shared_llm is None or _shared_llm.config is not config:
+        _shared_llm = LocalLLMProvider(config)
+    return _shared_llm
@@ -0,0 +1,134 @@
+"""Shrink source files before they are embedded in LLM prompts."""
+import ast
+import re
+from typing import Iterable, List, Tuple
+
+# Rough characters-per-token ratio for source code
+_CHARS_PER_TOKEN = 4
+# Lines that start a definition in the languages run_command supports
+_DEFINITION_RE = re.compile(
+    r"^\s*(?:export\s+)?(?:pub(?:\(\w+\))?\s+)?(?:async\s+)?"
+    r"(?:def|class|function|fn|func|struct|enum|impl|trait|interface|type)\b"
+    r"|^[A-Za-z_][\w\s\*&:<>,]*\([^;]*\)\s*\{?\s*$"
+)
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token count estimate for `text`."""
+    return len(text) // _CHARS_PER_TOKEN + 1
+
+def _truncate(text: str, max_tokens: int) -> str:
+    """Cut `text` to roughly `max_tokens`, ending on a line boundary."""
+    limit = max_tokens * _CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text.rfind("\n", 0, limit)
+    return text[:cut if cut > 0 else limit] + "\n... (truncated)"
+
+def _elidable_functions(tree: ast.AST, lines: List[str]) -> List[Tuple[int, int, int, str]]:
+    """Return (first_body_line, last_line, indent, name) for every function with a body to elide.
+    
+    Bodies that start on a line shared with the signature or docstring
+    (`def f(x): return x`) are skipped, as eliding their lines would drop that too.
+    """
+    functions = []
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        body = node.body
+        # Keep the docstring, elide everything after it
+        if body and isinstance(body[0], ast.Expr) and isinstance(getattr(body[0], "value", None), ast.Constant) \
+                and isinstance(body[0].value.value, str):
+            body = body[1:]
+        if not body or lines[body[0].lineno - 1][:body[0].col_offset].strip():
+            continue
+        functions.append((body[0].lineno, node.end_lineno, body[0].col_offset, node.name))
+    return functions
+
+def _compress_python(code: str, max_tokens: int, keywords: Iterable[str]) -> str:
+    """Elide the bodies of the largest functions until `code` fits in `max_tokens`."""
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        return _compress_generic(code, max_tokens)
+
+    lines = code.splitlines()
+    wanted = {k.lower() for k in keywords}
+    candidates = [f for f in _elidable_functions(tree, lines) if f[3].lower() not in wanted]
+    # Largest bodies first; they save the most tokens per elision
+    candidates.sort(key=lambda f: f[1] - f[0], reverse=True)
+
+    budget = max_tokens * _CHARS_PER_TOKEN
+    size = len(code)
+    elided: List[Tuple[int, int, int]] = []
+    for start, end, indent, _ in candidates:
+        if size <= budget:
+            break
+        if any(s <= start and end <= e for s, e, _ in elided):
+            continue  # nested in a body that is already gone
+        # Dropping this body also drops any nested bodies elided before it
+        elided = [(s, e, i) for s, e, i in elided if not (start <= s and e <= end)]
+        elided.append((start, end, indent))
+        size = len(code) - sum(
+            sum(len(line) + 1 for line in lines[s - 1:e]) for s, e, _ in elided
+        )
+
+    for start, end, indent in sorted(elided, reverse=True):
+        lines[start - 1:end] = [" " * indent + "..."]
+    return _truncate("\n".join(lines), max_tokens)
+
+def _compress_generic(code: str, max_tokens: int) -> str:
+    """List the definitions in `code` followed by as much of the file as fits."""
+    outline = "\n".join(line.rstrip() for line in code.splitlines() if _DEFINITION_RE.match(line))
+    head_tokens = max_tokens - estimate_tokens(outline)
+    if not outline or head_tokens <= 0:
+        return _truncate(code, max_tokens)
+    return f"Definitions in this file:\n{outline}\n\nStart of the file:\n{_truncate(code, head_tokens)}"
+
+def _python_outline(tree: ast.AST) -> str:
+    """List the classes and functions in a parsed module with their line numbers."""
+    entries = []
+
+    def visit(node: ast.AST, depth: int):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, ast.ClassDef):
+                entries.append(f"{child.lineno:>5} {'  ' * depth}class {child.name}")
+            elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                args = ", ".join(a.arg for a in child.args.args)
+                prefix = "async def" if isinstance(child, ast.AsyncFunctionDef) else "def"
+                entries.append(f"{child.lineno:>5} {'  ' * depth}{prefix} {child.name}({args})")
+            else:
+                continue
+            visit(child, depth + 1)
+
+    visit(tree, 0)
+    return "\n".join(entries)
+
+def compress(code: str, ext: str = "", max_tokens: int = 4000, keywords: Iterable[str] = ()) -> str:
+    """Return `code`, shortened to about `max_tokens` tokens if it is larger.
+
+    Python files keep every signature and docstring and lose the bodies of their
+    largest functions first; functions named in `keywords` are kept intact. Other
+    languages get an outline of their definitions plus the start of the file.
+    """
+    if estimate_tokens(code) <= max_tokens:
+        return code
+    if ext == ".py":
+        return _compress_python(code, max_tokens, keywords)
+    return _compress_generic(code, max_tokens)
+
+def build_code_summary(code: str, ext: str = "", max_tokens: int = 4000) -> str:
+    """Build the representation of a file shared by every prompt about it.
+
+    This is the output of `compress`, preceded for Python files by an outline of
+    its classes and functions with line numbers.
+    """
+    compressed = compress(code, ext, max_tokens)
+    if ext != ".py":
+        return compressed
+    try:
+        outline = _python_outline(ast.parse(code))
+    except (SyntaxError, ValueError):
+        return compressed
+    if not outline:
+        return compressed
+    return f"Outline (line numbers):\n{outline}\n\nCode:\n{compressed}"
@@ -0,0 +1,145 @@
+"""On-disk LLM response cache for Orby Coder."""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Generator, List, Optional
+
+# Cached responses expire after a day
+DEFAULT_TTL = 86400
+# Size of the pieces a cached response is replayed in when streaming
+_REPLAY_CHUNK = 64
+# Responses also kept in memory, so repeats within one process skip SQLite
+_MEMORY_SIZE = 256
+
+class ResponseCache:
+    """SQLite-backed cache of LLM responses keyed by the model, sampling settings and messages.
+    
+    The most recently used entries are also held in an in-memory LRU.
+    """
+
+    def __init__(self, path: Optional[Path] = None, ttl: int = DEFAULT_TTL, enabled: bool = True):
+        self.path = path or Path.home() / ".orby" / "cache.db"
+        self.ttl = ttl
+        self.enabled = enabled
+        self._conn: Optional[sqlite3.Connection] = None
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires, response)
+        # The cache may be shared with background request threads
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the cache database on first use."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, response TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+        return self._conn
+
+    @staticmethod
+    def make_key(model: str, messages: List[Dict[str, Any]], temperature: Optional[float] = None,
+                 max_tokens: Optional[int] = None) -> str:
+        """Hash a model name, its sampling settings and a message list into a cache key."""
+        payload = json.dumps({"m": model, "t": temperature, "n": max_tokens, "msgs": messages}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    @staticmethod
+    def make_search_key(query: str) -> str:
+        """Key web search results by the normalized query."""
+        payload = json.dumps({"search": " ".join(query.lower().split())})
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    @classmethod
+    def request_key(cls, llm, messages: List[Dict[str, Any]], model: Optional[str] = None) -> str:
+        """Key for sending `messages` to `llm` with its current config."""
+        config = llm.config
+        return cls.make_key(model or config.default_model, messages, config.temperature, config.max_tokens)
+
+    @staticmethod
+    def make_file_key(model: str, task: str, content_hash: str, system_prompt: str,
+                      temperature: Optional[float] = None, max_tokens: Optional[int] = None) -> str:
+        """Key a per-file task (explain, analyze, ...) by the hash of the file's bytes and the sampling settings."""
+        payload = json.dumps({"m": model, "t": temperature, "n": max_tokens, "task": task, "sha": content_hash,
+                              "sys": system_prompt}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for `key`, or None on a miss or expired entry."""
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None and cached[0] >= now:
+                self._memory.move_to_end(key)
+                return cached[1]
+            try:
+                row = self._connection().execute(
+                    "SELECT response, expires FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error:
+                return None
+            if row is None or row[1] < now:
+                return None
+            self._remember(key, row[0], row[1])
+        return row[0]
+    
+    def _remember(self, key: str, response: str, expires: float):
+        """Put an entry in the in-memory LRU; the caller holds the lock."""
+        self._memory[key] = (expires, response)
+        self._memory.move_to_end(key)
+        if len(self._memory) > _MEMORY_SIZE:
+            self._memory.popitem(last=False)
+
+    def set(self, key: str, response: str):
+        """Store a response; failures to write the cache are ignored."""
+        if not self.enabled:
+            return
+        expires = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, response, expires)
+            try:
+                with self._connection() as conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO responses (key, response, expires) VALUES (?, ?, ?)",
+                        (key, response, expires)
+                    )
+            except sqlite3.Error:
+                pass
+
+    def chat_complete(self, llm, messages: list, model: Optional[str] = None, key: Optional[str] = None) -> str:
+        """Return a cached response for the request, calling `llm.chat_complete` on a miss.
+
+        `key` overrides the default `request_key`.
+        """
+        key = key or self.request_key(llm, messages, model)
+        response = self.get(key)
+        if response is None:
+            response = llm.chat_complete(messages, model)
+            self.set(key, response)
+        return response
+
+    def stream_chat(self, llm, messages: list, model: Optional[str] = None, key: Optional[str] = None,
+                    **kwargs) -> Generator[str, None, None]:
+        """Stream a response, replaying it from the cache when possible.
+
+        On a miss the chunks from `llm.stream_chat` are passed through and the full
+        response is stored once the stream has been consumed completely.
+        """
+        key = key or self.request_key(llm, messages, model)
+        cached = self.get(key)
+        if cached is not None:
+            for start in range(0, len(cached), _REPLAY_CHUNK):
+                yield cached[start:start + _REPLAY_CHUNK]
+            return
+
+        parts = []
+        for chunk in llm.stream_chat(messages, model, **kwargs):
+            parts.append(chunk)
+            yield chunk
+        self.set(key, "".join(parts))
@@ -0,0 +1,103 @@
+"""Near-duplicate prompt cache for Orby Coder."""
+import hashlib
+import json
+import re
+import sqlite3
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import List, Optional
+
+from orby_coder.core.response_cache import DEFAULT_TTL
+
+# Filler words that do not change what a coding request asks for
+_STOP_WORDS = frozenset({
+    "a", "an", "the", "this", "that", "these", "those", "it", "its", "is", "are",
+    "please", "can", "could", "would", "you", "me", "my", "i", "to", "for", "of",
+    "in", "on", "and", "just", "some", "kindly", "help",
+})
+_WORD_RE = re.compile(r"\w+")
+
+def _tokenize(text: str) -> List[str]:
+    """Return the words of `text` in order, without filler words."""
+    return [w for w in _WORD_RE.findall(text.lower()) if w not in _STOP_WORDS]
+
+def _similarity(a: List[str], b: List[str]) -> float:
+    """Similarity of two word sequences; reordering the same words lowers it."""
+    return SequenceMatcher(None, a, b, autojunk=False).ratio()
+
+class SemanticCache:
+    """Cache that answers paraphrased prompts with a previously generated response.
+
+    Entries only match when the model and the surrounding context (system prompt,
+    file content, ...) are identical; the prompts themselves are compared as word
+    sequences, so "sort then reverse" never matches "reverse then sort". A
+    threshold of None disables the cache.
+    """
+
+    def __init__(self, threshold: Optional[float] = None, path: Optional[Path] = None,
+                 ttl: int = DEFAULT_TTL, enabled: bool = True):
+        self.threshold = threshold
+        self.path = path or Path.home() / ".orby" / "cache.db"
+        self.ttl = ttl
+        self.enabled = enabled and threshold is not None
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the cache database on first use."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path))
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS semantic_prompts "
+                "(scope TEXT NOT NULL, words TEXT NOT NULL, response TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS semantic_prompts_scope ON semantic_prompts (scope)"
+            )
+        return self._conn
+
+    @staticmethod
+    def _scope(model: str, context: str) -> str:
+        """Hash the parts of a request that must match exactly."""
+        return hashlib.sha256(f"{model}\0{context}".encode("utf-8")).hexdigest()
+
+    def lookup(self, model: str, context: str, prompt: str) -> Optional[str]:
+        """Return the response cached for the closest prompt above the threshold."""
+        if not self.enabled:
+            return None
+        words = _tokenize(prompt)
+        if not words:
+            return None
+        try:
+            rows = self._connection().execute(
+                "SELECT words, response FROM semantic_prompts WHERE scope = ? AND expires >= ?",
+                (self._scope(model, context), time.time())
+            ).fetchall()
+        except sqlite3.Error:
+            return None
+
+        best, best_score = None, self.threshold
+        for stored, response in rows:
+            score = _similarity(words, json.loads(stored))
+            if score >= best_score:
+                best, best_score = response, score
+        return best
+
+    def add(self, model: str, context: str, prompt: str, response: str):
+        """Remember `response` as the answer to `prompt`; write failures are ignored."""
+        if not self.enabled:
+            return
+        words = _tokenize(prompt)
+        if not words:
+            return
+        try:
+            with self._connection() as conn:
+                now = time.time()
+                conn.execute("DELETE FROM semantic_prompts WHERE expires < ?", (now,))
+                conn.execute(
+                    "INSERT INTO semantic_prompts (scope, words, response, expires) VALUES (?, ?, ?, ?)",
+                    (self._scope(model, context), json.dumps(words), response, now + self.ttl)
+                )
+        except sqlite3.Error:
+            pass
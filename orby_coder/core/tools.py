@@ -1,12 +1,142 @@
 """Gemini CLI-style tools for Orby Coder."""
 import os
+import re
+import selectors
 import subprocess
 import json
-import platform
-from typing import Dict, Any, Optional, List
-from pathlib import Path
-import requests
-from datetime import datetime
+import time
+from typing import Dict, Any, Iterable, Iterator, Optional, List, Tuple
+import httpx
+from itertools import chain, islice
+from orby_coder.core.response_cache import ResponseCache
+
+# Shell output kept per stream; anything before the last _OUTPUT_LIMIT bytes is dropped
+_OUTPUT_LIMIT = 1 << 20
+_READ_SIZE = 4096
+
+def _bounded_text(buffer: bytearray, dropped: bool) -> str:
+    text = buffer.decode("utf-8", errors="replace")
+    return f"... (earlier output truncated)\n{text}" if dropped else text
+
+def _collect_output(proc: subprocess.Popen, timeout: float) -> Tuple[str, str]:
+    """Read a process's stdout and stderr as they arrive and wait for it to exit.
+    
+    Only the last _OUTPUT_LIMIT bytes of each stream are kept. The process is killed
+    and subprocess.TimeoutExpired raised if it runs longer than `timeout` seconds.
+    """
+    if os.name == "nt":
+        # Windows pipes cannot be polled with selectors
+        try:
+            stdout, stderr = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.communicate()
+            raise
+        return (_bounded_text(bytearray(stdout[-_OUTPUT_LIMIT:]), len(stdout) > _OUTPUT_LIMIT),
+                _bounded_text(bytearray(stderr[-_OUTPUT_LIMIT:]), len(stderr) > _OUTPUT_LIMIT))
+    
+    buffers = {proc.stdout: bytearray(), proc.stderr: bytearray()}
+    dropped = {proc.stdout: False, proc.stderr: False}
+    deadline = time.monotonic() + timeout
+    with selectors.DefaultSelector() as selector:
+        for pipe in buffers:
+            selector.register(pipe, selectors.EVENT_READ)
+        while selector.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                proc.kill()
+                proc.wait()
+                raise subprocess.TimeoutExpired(proc.args, timeout)
+            for key, _ in selector.select(remaining):
+                chunk = os.read(key.fd, _READ_SIZE)
+                if not chunk:
+                    selector.unregister(key.fileobj)
+                    continue
+                buffer = buffers[key.fileobj]
+                buffer += chunk
+                if len(buffer) > _OUTPUT_LIMIT:
+                    del buffer[:len(buffer) - _OUTPUT_LIMIT]
+                    dropped[key.fileobj] = True
+    try:
+        proc.wait(timeout=max(deadline - time.monotonic(), 0))
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        raise
+    return (_bounded_text(buffers[proc.stdout], dropped[proc.stdout]),
+            _bounded_text(buffers[proc.stderr], dropped[proc.stderr]))
+
+# Shell separators and operators between the words of a command
+_COMMAND_SPLIT_RE = re.compile(r"[\s;&|()<>`]+")
+
+def _command_words(command_lower: str) -> set:
+    """Program-like words of a lowercased command: path prefixes and mkfs.<type> suffixes removed."""
+    words = set()
+    for token in _COMMAND_SPLIT_RE.split(command_lower):
+        name = token.rsplit("/", 1)[-1]
+        words.add(name.split(".", 1)[0] if name.startswith("mkfs.") else name)
+    return words
+
+# DuckDuckGo's Instant Answer API needs no key and answers in JSON
+_SEARCH_URL = "https://api.duckduckgo.com/"
+_SEARCH_TIMEOUT = 5
+# Results kept per query, and how long they are reused from the on-disk cache
+_SEARCH_MAX_RESULTS = 10
+_SEARCH_TTL = 3600
+_search_client: Optional[httpx.Client] = None
+_search_cache: Optional[ResponseCache] = None  # kept so hits are served from its in-memory tier
+
+def _flatten_topics(topics: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Yield the topics in DuckDuckGo's RelatedTopics, expanding named groups."""
+    for topic in topics:
+        if "Topics" in topic:
+            yield from _flatten_topics(topic["Topics"])
+        elif topic.get("FirstURL") and topic.get("Text"):
+            yield topic
+
+def search_web(query: str, num_results: int = 5) -> List[Dict[str, str]]:
+    """Return up to `num_results` {title, url, snippet} results for `query`.
+    
+    Results are cached on disk for _SEARCH_TTL seconds. Raises httpx.HTTPError
+    or ValueError when the search service cannot be reached or answers garbage.
+    """
+    global _search_client, _search_cache
+    if _search_cache is None:
+        _search_cache = ResponseCache(ttl=_SEARCH_TTL)
+    cache = _search_cache
+    key = cache.make_search_key(query)
+    cached = cache.get(key)
+    if cached is not None:
+        return json.loads(cached)[:num_results]
+    
+    if _search_client is None:
+        _search_client = httpx.Client(follow_redirects=True)
+    response = _search_client.get(
+        _SEARCH_URL,
+        params={"q": query, "format": "json", "no_html": 1, "skip_disambig": 1},
+        timeout=_SEARCH_TIMEOUT
+    )
+    response.raise_for_status()
+    data = response.json()
+    
+    results = []
+    if data.get("AbstractText"):
+        results.append({
+            "title": data.get("Heading") or query,
+            "url": data.get("AbstractURL", ""),
+            "snippet": data["AbstractText"]
+        })
+    for topic in chain(data.get("Results", []), _flatten_topics(data.get("RelatedTopics", []))):
+        if len(results) >= _SEARCH_MAX_RESULTS:
+            break
+        if topic.get("FirstURL") and topic.get("Text"):
+            results.append({
+                "title": topic["Text"].split(" - ", 1)[0],
+                "url": topic["FirstURL"],
+                "snippet": topic["Text"]
+            })
+    cache.set(key, json.dumps(results))
+    return results[:num_results]
 
 class BaseTool:
     """Base class for all tools."""
@@ -32,6 +162,12 @@ class BaseTool:
 class ShellTool(BaseTool):
     """Execute shell commands - Gemini CLI style."""
     
+    # Blocked wherever they appear in the command
+    _DANGEROUS_PATTERNS = ("rm -rf /", "rm -r /", "dd if=", ":(){:&};:")
+    # Blocked, or needing confirmation, when they appear as a word of the command
+    _DANGEROUS_PROGRAMS = frozenset({"format", "mkfs"})
+    _CONFIRM_PROGRAMS = frozenset({"rm", "delete", "format", "mkfs", "chmod", "chown"})
+    
     def __init__(self):
         super().__init__(
             "run_shell_command",
@@ -49,15 +185,13 @@ class ShellTool(BaseTool):
             return "Command must be a non-empty string"
         
         # Check for dangerous commands
-        dangerous_commands = [
-            "rm -rf /", "rm -r /", "format", "mkfs", 
-            "dd if=", ":(){:&};:"
-        ]
-        
         command_lower = command.lower()
-        for danger in dangerous_commands:
+        for danger in self._DANGEROUS_PATTERNS:
             if danger in command_lower:
                 return f"Dangerous command blocked: {danger}"
+        dangerous = self._DANGEROUS_PROGRAMS.intersection(_command_words(command_lower))
+        if dangerous:
+            return f"Dangerous command blocked: {min(dangerous)}"
         
         return None
     
@@ -66,21 +200,14 @@ class ShellTool(BaseTool):
         command = params.get("command", "")
         
         # Commands that typically require confirmation
-        confirmation_commands = [
-            "rm", "delete", "format", "mkfs", "chmod", "chown"
-        ]
-        
-        command_lower = command.lower()
-        for confirm_cmd in confirmation_commands:
-            if confirm_cmd in command_lower:
-                return {
-                    "type": "exec",
-                    "title": "Confirm Shell Command",
-                    "command": command,
-                    "message": f"This command may be destructive. Are you sure you want to execute: {command}?"
-                }
-        
-        return False
+        if self._CONFIRM_PROGRAMS.isdisjoint(_command_words(command.lower())):
+            return False
+        return {
+            "type": "exec",
+            "title": "Confirm Shell Command",
+            "command": command,
+            "message": f"This command may be destructive. Are you sure you want to execute: {command}?"
+        }
     
     def execute(self, params: Dict[str, Any], signal: Optional[Any] = None) -> Dict[str, Any]:
         """Execute shell command."""
@@ -88,32 +215,32 @@ class ShellTool(BaseTool):
         directory = params.get("directory", os.getcwd())
         
         try:
-            # Execute command
-            result = subprocess.run(
+            # Execute command, reading its output as it is produced
+            with subprocess.Popen(
                 command,
                 shell=True,
-                capture_output=True,
-                text=True,
-                cwd=directory,
-                timeout=30
-            )
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                cwd=directory
+            ) as proc:
+                stdout, stderr = _collect_output(proc, timeout=30)
             
             # Format result for LLM
             llm_content = (
                 f"Command: {command}\n"
                 f"Directory: {directory}\n"
-                f"Output: {result.stdout or '(empty)'}\n"
-                f"Error: {result.stderr or '(none)'}\n"
-                f"Exit Code: {result.returncode}\n"
+                f"Output: {stdout or '(empty)'}\n"
+                f"Error: {stderr or '(none)'}\n"
+                f"Exit Code: {proc.returncode}\n"
                 f"Signal: (none)\n"
                 f"Background PIDs: (none)\n"
-                f"Process Group PGID: {result.returncode}\n"
+                f"Process Group PGID: {proc.returncode}\n"
             )
             
             # Format result for display
-            return_display = result.stdout or ""
-            if result.stderr:
-                return_display += f"\n[STDERR] {result.stderr}"
+            return_display = stdout or ""
+            if stderr:
+                return_display += f"\n[STDERR] {stderr}"
             
             return {
                 "llmContent": llm_content,
@@ -139,7 +266,7 @@ class WebSearchTool(BaseTool):
         super().__init__(
             "google_web_search",
             "GoogleSearch",
-            "Performs a web search using Google Search and returns the results."
+            "Performs a web search and returns the results."
         )
     
     def validate_params(self, params: Dict[str, Any]) -> str | None:
@@ -157,32 +284,34 @@ class WebSearchTool(BaseTool):
         """Execute web search."""
         query = params["query"]
         
-        # In a real implementation, this would use Google Search API
-        # For now, simulate search results
-        timestamp = datetime.now().isoformat()
+        try:
+            search_results = search_web(query)
+        except (httpx.HTTPError, ValueError) as e:
+            return {
+                "llmContent": f"Web search for \"{query}\" failed: {str(e)}",
+                "returnDisplay": f"Error: {str(e)}",
+                "sources": []
+            }
         
-        search_results = [
-            {
-                "title": f"Search results for: {query}",
-                "url": f"https://example.com/search?q={query}",
-                "snippet": f"This is a simulated search result for '{query}'. In a real implementation, this would show actual web search results."
-            },
-            {
-                "title": f"Related information about {query}",
-                "url": f"https://example.com/related/{query}",
-                "snippet": f"Additional context about '{query}' that could help answer your question."
+        if not search_results:
+            return {
+                "llmContent": f"Web search for \"{query}\" returned no results.",
+                "returnDisplay": f"No search results for \"{query}\".",
+                "sources": []
             }
-        ]
         
         # Format for LLM
-        sources_text = "\n".join([
+        snippets_text = "\n".join(
+            f"[{i+1}] {result['snippet']}" for i, result in enumerate(search_results)
+        )
+        sources_text = "\n".join(
             f"[{i+1}] {result['title']} ({result['url']})"
             for i, result in enumerate(search_results)
-        ])
+        )
         
         llm_content = (
             f"Web search results for \"{query}\":\n\n"
-            f"{search_results[0]['snippet']}\n\n"
+            f"{snippets_text}\n\n"
             f"Sources:\n{sources_text}"
         )
         
@@ -230,26 +359,28 @@ class ReadFileTool(BaseTool):
         limit = params.get("limit")
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-            
-            # Apply offset and limit if specified
             start_line = offset
-            if limit:
-                end_line = min(start_line + limit, len(lines))
-                content_lines = lines[start_line:end_line]
-            else:
-                content_lines = lines[start_line:]
-            
-            content = ''.join(content_lines)
+            with open(file_path, 'r', encoding='utf-8') as f:
+                if not start_line and not limit:
+                    # Whole file: one read, without building a list of lines
+                    content = f.read()
+                    shown_lines = remaining = 0
+                else:
+                    # Only the requested lines are kept in memory
+                    content_lines = list(islice(f, start_line, start_line + limit if limit else None))
+                    content = ''.join(content_lines)
+                    shown_lines = len(content_lines)
+                    # Lines past the slice are just counted, for the truncation notice
+                    remaining = sum(1 for _ in f) if limit else 0
             
             # Check if content was truncated
-            is_truncated = limit and len(lines) > (start_line + (limit or len(lines)))
+            is_truncated = remaining > 0
             
             if is_truncated:
+                total_lines = start_line + shown_lines + remaining
                 llm_content = (
                     f"\nIMPORTANT: The file content has been truncated.\n"
-                    f"Status: Showing lines {start_line+1}-{start_line+len(content_lines)} of {len(lines)} total lines.\n"
+                    f"Status: Showing lines {start_line+1}-{start_line+shown_lines} of {total_lines} total lines.\n"
                     f"Action: To read more of the file, you can use the 'offset' and 'limit' parameters in a subsequent 'read_file' call.\n\n"
                     f"--- FILE CONTENT (truncated) ---\n{content}"
                 )
@@ -259,7 +390,7 @@ class ReadFileTool(BaseTool):
             # Format for display
             return_display = f"Read file: {file_path}"
             if is_truncated:
-                return_display += f" (lines {start_line+1}-{start_line+len(content_lines)})"
+                return_display += f" (lines {start_line+1}-{start_line+shown_lines})"
             
             return {
                 "llmContent": llm_content,
@@ -278,6 +409,7 @@ class ToolRegistry:
     
     def __init__(self):
         self.tools: Dict[str, BaseTool] = {}
+        self._schema_cache: Optional[Tuple[Dict[str, Any], ...]] = None  # rebuilt after register_tool
         self.register_builtin_tools()
     
     def register_builtin_tools(self):
@@ -289,21 +421,24 @@ class ToolRegistry:
     def register_tool(self, tool: BaseTool):
         """Register a tool."""
         self.tools[tool.name] = tool
+        self._schema_cache = None
     
     def get_tool(self, name: str) -> BaseTool | None:
         """Get a tool by name."""
         return self.tools.get(name)
     
     def get_tool_schemas(self) -> List[Dict[str, Any]]:
-        """Get schemas for all registered tools."""
-        schemas = []
-        for tool in self.tools.values():
-            schema = {
-                "name": tool.name,
-                "description": tool.description
-            }
-            schemas.append(schema)
-        return schemas
+        """Get schemas for all registered tools.
+        
+        The schemas are built once per set of registered tools; every caller gets its
+        own copies, so editing them does not affect later callers.
+        """
+        if self._schema_cache is None:
+            self._schema_cache = tuple(
+                {"name": tool.name, "description": tool.description}
+                for tool in self.tools.values()
+            )
+        return [dict(schema) for schema in self._schema_cache]
 
 
 # Global tool registry instance
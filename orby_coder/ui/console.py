@@ -0,0 +1,64 @@
+"""Shared Rich console and streaming output helpers for Orby Coder commands."""
+import functools
+import os
+import sys
+import time
+from typing import Iterable
+
+# Streamed tokens are coalesced and flushed at most once per frame (~60 fps),
+# or immediately at a newline
+_STREAM_FRAME_SECONDS = 0.016
+# On a TTY, pending bytes are also written out once the buffer reaches this size
+_STREAM_BUFFER_BYTES = 256
+
+@functools.lru_cache(maxsize=None)
+def get_console():
+    """Return the process-wide Rich Console, creating it on first use."""
+    from rich.console import Console
+    return Console()
+
+@functools.lru_cache(maxsize=64)
+def markdown(text: str):
+    """Return a Markdown renderable for `text`, reusing the parse of identical text."""
+    from rich.markdown import Markdown
+    return Markdown(text)
+
+def _write_all(fd: int, data: bytes):
+    """os.write() until every byte of `data` has been written."""
+    while data:
+        data = data[os.write(fd, data):]
+
+def write_stream(chunks: Iterable[str]) -> str:
+    """Write streamed chunks straight to stdout, bypassing Rich, and return the full text."""
+    stdout = sys.stdout
+    parts = []
+    last_flush = time.monotonic()
+    if not stdout.isatty():
+        # Pipes and files: let Python's buffered text writer batch the output
+        for chunk in chunks:
+            stdout.write(chunk)
+            parts.append(chunk)
+            now = time.monotonic()
+            if "\n" in chunk or now - last_flush >= _STREAM_FRAME_SECONDS:
+                stdout.flush()
+                last_flush = now
+        stdout.flush()
+        return "".join(parts)
+    
+    # Terminals: encode once per chunk and write straight to the fd, skipping the
+    # text layer. Anything Rich/print() already queued has to land first.
+    stdout.flush()
+    fd = stdout.fileno()
+    encoding = stdout.encoding or "utf-8"
+    buf = bytearray()
+    for chunk in chunks:
+        buf += chunk.encode(encoding, "replace")
+        parts.append(chunk)
+        now = time.monotonic()
+        if ("\n" in chunk or len(buf) >= _STREAM_BUFFER_BYTES
+                or now - last_flush >= _STREAM_FRAME_SECONDS):
+            _write_all(fd, buf)
+            buf.clear()
+            last_flush = now
+    _write_all(fd, buf)
+    return "".join(parts)
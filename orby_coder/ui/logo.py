@@ -1,4 +1,5 @@
 """ASCII logo for Orby Coder."""
+import sys
 
 ORBY_LOGO = r"""
     ____                    __          
@@ -10,9 +11,20 @@ ORBY_LOGO = r"""
       Orby Coder - AI CLI Tool
 """
 
+# Encoded once; the trailing newline matches what print() added
+ORBY_LOGO_BYTES = (ORBY_LOGO + "\n").encode("utf-8")
+
 def print_logo():
     """Print the Orby Coder ASCII logo."""
-    print(ORBY_LOGO)
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        # Replaced stdout (captured output, etc.) without a byte layer
+        sys.stdout.write(ORBY_LOGO + "\n")
+        return
+    # Anything already written as text goes out first
+    sys.stdout.flush()
+    buffer.write(ORBY_LOGO_BYTES)
+    buffer.flush()
 
 if __name__ == "__main__":
     print_logo()
\ No newline at end of file
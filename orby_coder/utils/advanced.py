@@ -1,20 +1,105 @@
 """Advanced utilities for Orby Coder - terminal execution, web search, IDE integration."""
+import asyncio
+import functools
+import importlib
+import locale
 import subprocess
 import os
-import json
-from typing import Optional, Dict, Any, List
+import re
+import shlex
+import shutil
+import threading
+import time
+from typing import Optional, Dict, Any, List, Tuple
 from pathlib import Path
-import requests
-import pyperclip
-import psutil
-from git import Repo
-import webbrowser
-from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+# Seconds a terminal command may run before it is killed
+COMMAND_TIMEOUT = 30
+
+def _import_optional(module: str, extra: str, package: Optional[str] = None):
+    """Import an optional dependency, naming the extra that installs it when it is missing."""
+    try:
+        return importlib.import_module(module)
+    except ImportError as e:
+        raise ImportError(
+            f"{package or module} is not installed; install it with: pip install 'orby-coder[{extra}]'"
+        ) from e
+
+# Fragments of commands that should never be executed, matched anywhere in the
+# command and regardless of case, all in one regex scan. The regex is case-sensitive
+# and run on the lowercased command: re.IGNORECASE turns off the regex engine's
+# literal-prefix scanning and is about 8x slower on typical commands.
+# Recursive commands on "/" only match the root itself or "/*", so
+# `rm -rf /tmp/build` is allowed.
+_ROOT_TARGET = r"/(?:$|[\s*;&|])"
+_DANGEROUS_PATTERNS = (
+    r"rm -rf " + _ROOT_TARGET, r"rm -r " + _ROOT_TARGET, r"rm - " + _ROOT_TARGET,
+    re.escape("dd if=/dev/"), re.escape("dd of=/dev/"),
+    re.escape("mkfs"),
+    re.escape(">: /dev/"),
+    re.escape("mv ~"),
+    r"chmod -r 777 " + _ROOT_TARGET, r"chown -r root " + _ROOT_TARGET,
+    re.escape(":(){:&};:"),
+)
+_DANGEROUS_COMMAND_RE = re.compile("|".join(_DANGEROUS_PATTERNS))
+
+# Characters that only a shell understands: pipes, redirection, chaining,
+# substitution, globbing, comments, escapes and line breaks
+_SHELL_SYNTAX_RE = re.compile(r"[|&;<>()$`\\*?~\[\]{}#!\n]")
+
+def _direct_argv(command: str) -> Optional[List[str]]:
+    """Split `command` into an argv that can be exec'd without /bin/sh, or None if it needs the shell."""
+    if os.name != 'posix' or _SHELL_SYNTAX_RE.search(command):
+        return None
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return None
+    # `FOO=1 cmd` sets a variable for the command; only the shell does that
+    if not argv or '=' in argv[0]:
+        return None
+    return argv
+
+def _in_process_output(argv: List[str], cwd: str) -> Optional[bytes]:
+    """Output of `pwd` or `cat FILE...` produced without starting a process, or None to run the real command.
+    
+    Options, special files and unreadable files are left to the real program, which
+    also reports the errors.
+    """
+    program, args = argv[0], argv[1:]
+    if program == 'pwd' and not args:
+        return os.fsencode(os.path.realpath(cwd)) + b'\n'
+    if program != 'cat' or not args or any(arg.startswith('-') for arg in args):
+        return None
+    parts = []
+    for name in args:
+        path = os.path.join(cwd, name)
+        # Only regular files: reading a FIFO or device could block or never end
+        if not os.path.isfile(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                parts.append(f.read())
+        except OSError:
+            return None
+    return b''.join(parts)
+
 class TerminalExecutor:
     """Execute terminal commands with user permissions - Gemini CLI style tool."""
     
+    @staticmethod
+    def _result(command: str, stdout: str, stderr: str, return_code: int) -> Dict[str, Any]:
+        return {
+            'command': command,
+            'stdout': stdout,
+            'stderr': stderr,
+            'return_code': return_code,
+            'success': return_code == 0,
+            'timestamp': datetime.now().isoformat()
+        }
+    
     @staticmethod
     def execute_command(command: str, cwd: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -28,41 +113,79 @@ class TerminalExecutor:
             Dictionary with 'stdout', 'stderr', 'return_code', 'command'
         """
         try:
-            result = subprocess.run(
-                command,
-                shell=True,
+            workdir = str(cwd or Path.cwd())
+            run = functools.partial(
+                subprocess.run,
                 capture_output=True,
                 text=True,
-                cwd=cwd or Path.cwd(),
-                timeout=30  # 30 second timeout for safety
+                cwd=workdir,
+                timeout=COMMAND_TIMEOUT  # timeout for safety
             )
-            
-            return {
-                'command': command,
-                'stdout': result.stdout,
-                'stderr': result.stderr,
-                'return_code': result.returncode,
-                'success': result.returncode == 0,
-                'timestamp': datetime.now().isoformat()
-            }
+            argv = _direct_argv(command)
+            output = _in_process_output(argv, workdir) if argv else None
+            if output is not None:
+                # Decoded the way text=True decodes a child's output
+                text = output.decode(locale.getpreferredencoding(False))
+                return TerminalExecutor._result(command, text.replace('\r\n', '\n').replace('\r', '\n'), '', 0)
+            try:
+                # Plain commands skip the intermediate /bin/sh process
+                result = run(argv) if argv else run(command, shell=True)
+            except FileNotFoundError:
+                # Shell builtins (cd, export, ...) and unknown programs: let sh handle and report them
+                result = run(command, shell=True)
+            return TerminalExecutor._result(command, result.stdout, result.stderr, result.returncode)
         except subprocess.TimeoutExpired:
-            return {
-                'command': command,
-                'stdout': '',
-                'stderr': 'Command timed out after 30 seconds',
-                'return_code': -1,
-                'success': False,
-                'timestamp': datetime.now().isoformat()
-            }
+            return TerminalExecutor._result(command, '', f'Command timed out after {COMMAND_TIMEOUT} seconds', -1)
         except Exception as e:
-            return {
-                'command': command,
-                'stdout': '',
-                'stderr': str(e),
-                'return_code': -1,
-                'success': False,
-                'timestamp': datetime.now().isoformat()
-            }
+            return TerminalExecutor._result(command, '', str(e), -1)
+    
+    @staticmethod
+    async def execute_command_async(command: str, cwd: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Async version of `execute_command`; the event loop keeps running while the command does.
+        
+        Args:
+            command: Command to execute
+            cwd: Working directory (optional)
+            
+        Returns:
+            Dictionary with 'stdout', 'stderr', 'return_code', 'command'
+        """
+        try:
+            workdir = str(cwd or Path.cwd())
+            pipes = dict(stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, cwd=workdir)
+            argv = _direct_argv(command)
+            output = _in_process_output(argv, workdir) if argv else None
+            if output is not None:
+                return TerminalExecutor._result(command, output.decode(errors='replace'), '', 0)
+            try:
+                if not argv:
+                    raise FileNotFoundError
+                proc = await asyncio.create_subprocess_exec(*argv, **pipes)
+            except FileNotFoundError:
+                proc = await asyncio.create_subprocess_shell(command, **pipes)
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), COMMAND_TIMEOUT)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                return TerminalExecutor._result(command, '', f'Command timed out after {COMMAND_TIMEOUT} seconds', -1)
+            return TerminalExecutor._result(
+                command, stdout.decode(errors='replace'), stderr.decode(errors='replace'), proc.returncode
+            )
+        except Exception as e:
+            return TerminalExecutor._result(command, '', str(e), -1)
+    
+    @staticmethod
+    def execute_commands(commands: List[str], cwd: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Run several commands at the same time; results are in the order of `commands`.
+        
+        Must not be called from a running event loop.
+        """
+        async def run_all():
+            return await asyncio.gather(*(TerminalExecutor.execute_command_async(c, cwd) for c in commands))
+        return list(asyncio.run(run_all()))
     
     @staticmethod
     def safe_command(command: str) -> bool:
@@ -75,47 +198,14 @@ class TerminalExecutor:
         Returns:
             True if command is safe, False otherwise
         """
-        # Dangerous commands that should never be executed
-        dangerous_patterns = [
-            'rm -rf /\??',
-            'rm -r /\??',
-            'rm - /\??',
-            'dd if=/dev/',
-            'dd of=/dev/',
-            'mkfs',
-            '>: /dev/',
-            'mv ~',
-            'chmod -R 777 /\??',
-            'chown -R root /\??',
-            ':(){:&};:'
-        ]
-        
-        # Potentially dangerous commands that require extra caution
-        cautious_patterns = [
-            'rm -rf',
-            'rm -r',
-            'sudo',
-            'shutdown',
-            'reboot',
-            'halt',
-            'poweroff'
-        ]
-        
-        command_lower = command.lower().strip()
-        
         # Block explicitly dangerous commands
-        for pattern in dangerous_patterns:
-            if pattern in command_lower:
-                return False
-        
-        # Warn about cautious commands (but don't block them)
-        for pattern in cautious_patterns:
-            if pattern in command_lower:
-                # In a real implementation, we might want to prompt the user for confirmation
-                pass
-        
-        return True
+        return _DANGEROUS_COMMAND_RE.search(command.lower()) is None
+
 
+# Threads used by WebSearcher.search_many; created on first use
+_SEARCH_WORKERS = 4
+_search_pool: Optional[ThreadPoolExecutor] = None
+_search_pool_lock = threading.Lock()
 
 class WebSearcher:
     """Web search functionality for online information - Gemini CLI style tool."""
@@ -125,8 +215,8 @@ class WebSearcher:
         """
         Perform a web search for the given query - Gemini CLI style.
         
-        In a production implementation, you would use a search API like Google Custom Search,
-        DuckDuckGo, or similar. For now, this is a placeholder implementation.
+        Uses DuckDuckGo through `search_web`, which keeps one HTTP client (and so its
+        open connections) for every search and caches results on disk.
         
         Args:
             query: Search query
@@ -135,33 +225,91 @@ class WebSearcher:
         Returns:
             List of search results or None if search fails
         """
-        # Placeholder implementation - in a real version you would use an API
-        # such as Google Custom Search, SerpAPI, DuckDuckGo API, etc.
+        import httpx
+        from orby_coder.core.tools import search_web
+        try:
+            results = search_web(query, num_results)
+        except (httpx.HTTPError, ValueError):
+            return None
         timestamp = datetime.now().isoformat()
-        
-        # Simulate web search with more realistic results
-        return [
-            {
-                "title": f"Search results for: {query}",
-                "url": "https://example.com/search?q=" + quote(query),
-                "snippet": f"This is a simulated search result for '{query}'. In a real implementation, this would show actual web search results from Google, DuckDuckGo, or other search engines.",
-                "timestamp": timestamp
-            },
-            {
-                "title": f"Related information about {query}",
-                "url": "https://example.com/related/" + quote(query),
-                "snippet": f"Additional context about '{query}' that could help answer your question. Gemini CLI would automatically use web search when it needs current information or isn't certain about a topic.",
-                "timestamp": timestamp
-            }
-        ]
+        return [dict(result, timestamp=timestamp) for result in results]
+    
+    @staticmethod
+    def search_many(queries: List[str], num_results: int = 5) -> List[Optional[List[Dict[str, Any]]]]:
+        """Run several searches concurrently; results are in the order of `queries`."""
+        global _search_pool
+        with _search_pool_lock:
+            if _search_pool is None:
+                _search_pool = ThreadPoolExecutor(max_workers=_SEARCH_WORKERS, thread_name_prefix="orby-search")
+        return list(_search_pool.map(lambda q: WebSearcher.search(q, num_results), queries))
+
 
+# Seconds to wait for an IDE launcher to fail before assuming it started
+_IDE_LAUNCH_GRACE = 0.05
 
 class IDEIntegration:
     """Integration with various IDEs like VSCode and Cursor - Gemini CLI style tool."""
     
+    # Where each IDE's launcher is looked for when the configured path does not exist
+    _CANDIDATE_PATHS = {
+        'vscode': (
+            '/usr/bin/code',
+            '/usr/local/bin/code',
+            '/Applications/Visual Studio Code.app/Contents/Resources/app/bin/code'
+        ),
+        'cursor': (
+            '/usr/local/bin/cursor',
+            '/usr/bin/cursor',
+            '/Applications/Cursor.app/Contents/Resources/app/bin/cursor'
+        ),
+    }
+    # Launcher names looked up on PATH after the candidate paths
+    _LAUNCHER_NAMES = {'vscode': 'code', 'cursor': 'cursor'}
+    # (ide, configured path) -> launcher found for it (None: not installed), shared by every instance
+    _resolved_paths: Dict[Tuple[str, str], Optional[str]] = {}
+    
     def __init__(self, config):
         self.config = config
     
+    @classmethod
+    def invalidate_cache(cls):
+        """Forget the launcher paths found so far, e.g. after an IDE was installed or moved."""
+        cls._resolved_paths.clear()
+    
+    def _resolve_ide_path(self, ide: str, configured_path: str) -> Optional[str]:
+        """Return the launcher for `ide`: the configured path, the first common location that exists or the one on PATH.
+        
+        Misses are cached too, so opening files with an IDE that is not installed never
+        touches the filesystem again until `invalidate_cache` is called.
+        """
+        key = (ide, configured_path)
+        if key not in self._resolved_paths:
+            path = next((p for p in (configured_path, *self._CANDIDATE_PATHS[ide]) if os.path.exists(p)), None)
+            self._resolved_paths[key] = path or shutil.which(self._LAUNCHER_NAMES[ide])
+        return self._resolved_paths[key]
+    
+    def _open_in(self, ide: str, configured_path: str, target: str) -> bool:
+        """Open a file or folder with the given IDE's launcher.
+        
+        The launchers hand off to the running editor (or daemonize), so the process is
+        detached and only checked for an immediate failure instead of waited on.
+        """
+        try:
+            launcher = self._resolve_ide_path(ide, configured_path)
+            if launcher is None:
+                return False  # IDE not found
+            proc = subprocess.Popen(
+                [launcher, target],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True
+            )
+            time.sleep(_IDE_LAUNCH_GRACE)
+            return proc.poll() in (None, 0)
+        except Exception:
+            return False
+    
     def open_file_in_vscode(self, file_path: str) -> bool:
         """
         Open a file in VSCode - Gemini CLI style integration.
@@ -172,26 +320,7 @@ class IDEIntegration:
         Returns:
             True if successful, False otherwise
         """
-        try:
-            vscode_path = self.config.ide_integration.vscode_path
-            if not os.path.exists(vscode_path):
-                # Try to find VSCode in common locations
-                common_paths = [
-                    '/usr/bin/code',
-                    '/usr/local/bin/code',
-                    '/Applications/Visual Studio Code.app/Contents/Resources/app/bin/code'
-                ]
-                for path in common_paths:
-                    if os.path.exists(path):
-                        vscode_path = path
-                        break
-                else:
-                    return False  # VSCode not found
-            
-            result = subprocess.run([vscode_path, file_path], capture_output=True, text=True, timeout=10)
-            return result.returncode == 0
-        except (subprocess.TimeoutExpired, Exception):
-            return False
+        return self._open_in('vscode', self.config.ide_integration.vscode_path, file_path)
     
     def open_file_in_cursor(self, file_path: str) -> bool:
         """
@@ -203,26 +332,7 @@ class IDEIntegration:
         Returns:
             True if successful, False otherwise
         """
-        try:
-            cursor_path = self.config.ide_integration.cursor_path
-            if not os.path.exists(cursor_path):
-                # Try to find Cursor in common locations
-                common_paths = [
-                    '/usr/local/bin/cursor',
-                    '/usr/bin/cursor',
-                    '/Applications/Cursor.app/Contents/Resources/app/bin/cursor'
-                ]
-                for path in common_paths:
-                    if os.path.exists(path):
-                        cursor_path = path
-                        break
-                else:
-                    return False  # Cursor not found
-            
-            result = subprocess.run([cursor_path, file_path], capture_output=True, text=True, timeout=10)
-            return result.returncode == 0
-        except (subprocess.TimeoutExpired, Exception):
-            return False
+        return self._open_in('cursor', self.config.ide_integration.cursor_path, file_path)
     
     def open_folder_in_vscode(self, folder_path: str) -> bool:
         """Open a folder in VSCode - Gemini CLI style."""
@@ -242,6 +352,34 @@ class ToolManager:
         self.web_searcher = WebSearcher()
         self.ide_integration = IDEIntegration(config)
     
+    async def aexecute_tools(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Execute several (tool_name, params) calls concurrently.
+        
+        Terminal commands run as async subprocesses; the other tools run on the
+        loop's default thread pool. Results are in the order of `calls`.
+        """
+        loop = asyncio.get_running_loop()
+        
+        async def run(tool_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
+            command = params.get("command", "")
+            if tool_name == "terminal_execution" and command and self.terminal_executor.safe_command(command):
+                result = await self.terminal_executor.execute_command_async(command)
+                return {
+                    "tool": "terminal_execution",
+                    "params": params,
+                    "result": result,
+                    "timestamp": result['timestamp'],
+                    "success": True
+                }
+            return await loop.run_in_executor(None, self.execute_tool, tool_name, params)
+        
+        return list(await asyncio.gather(*(run(name, params) for name, params in calls)))
+    
+    def execute_tools(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Blocking version of `aexecute_tools`; must not be called from a running event loop."""
+        return asyncio.run(self.aexecute_tools(calls))
+    
     def execute_tool(self, tool_name: str, params: Dict[str, Any]) -> Dict[str, Any]:
         """
         Execute a specific tool with parameters - Gemini CLI style tool usage.
@@ -254,97 +392,87 @@ class ToolManager:
             Tool execution result
         """
         timestamp = datetime.now().isoformat()
-        
+        handler = self._handlers.get(tool_name)
         try:
-            if tool_name == "terminal_execution":
-                command = params.get("command", "")
-                if command and self.terminal_executor.safe_command(command):
-                    result = self.terminal_executor.execute_command(command)
-                    return {
-                        "tool": "terminal_execution",
-                        "params": params,
-                        "result": result,
-                        "timestamp": timestamp,
-                        "success": True
-                    }
-                else:
-                    return {
-                        "tool": "terminal_execution",
-                        "params": params,
-                        "result": {"error": "Unsafe command blocked"},
-                        "timestamp": timestamp,
-                        "success": False
-                    }
-            
-            elif tool_name == "web_search":
-                query = params.get("query", "")
-                if query:
-                    results = self.web_searcher.search(query)
-                    return {
-                        "tool": "web_search",
-                        "params": params,
-                        "result": results,
-                        "timestamp": timestamp,
-                        "success": True
-                    }
-                else:
-                    return {
-                        "tool": "web_search",
-                        "params": params,
-                        "result": {"error": "No search query provided"},
-                        "timestamp": timestamp,
-                        "success": False
-                    }
-            
-            elif tool_name == "ide_open_file":
-                file_path = params.get("file_path", "")
-                ide = params.get("ide", "vscode")
-                if file_path and os.path.exists(file_path):
-                    if ide == "cursor":
-                        success = self.ide_integration.open_file_in_cursor(file_path)
-                    else:
-                        success = self.ide_integration.open_file_in_vscode(file_path)
-                    
-                    return {
-                        "tool": "ide_open_file",
-                        "params": params,
-                        "result": {"success": success, "message": f"File opened in {ide}" if success else f"Failed to open file in {ide}"},
-                        "timestamp": timestamp,
-                        "success": success
-                    }
-                else:
-                    return {
-                        "tool": "ide_open_file",
-                        "params": params,
-                        "result": {"error": "File not found or invalid path"},
-                        "timestamp": timestamp,
-                        "success": False
-                    }
-            
+            if handler is None:
+                result, success = {"error": f"Unknown tool: {tool_name}"}, False
             else:
-                return {
-                    "tool": tool_name,
-                    "params": params,
-                    "result": {"error": f"Unknown tool: {tool_name}"},
-                    "timestamp": timestamp,
-                    "success": False
-                }
-        
+                result, success = handler(self, params)
         except Exception as e:
-            return {
-                "tool": tool_name,
-                "params": params,
-                "result": {"error": str(e)},
-                "timestamp": timestamp,
-                "success": False
-            }
+            result, success = {"error": str(e)}, False
+        return {
+            "tool": tool_name,
+            "params": params,
+            "result": result,
+            "timestamp": timestamp,
+            "success": success
+        }
+    
+    # Each handler returns (result, success) for `execute_tool` to wrap
+    
+    def _tool_terminal(self, params: Dict[str, Any]) -> Tuple[Any, bool]:
+        command = params.get("command", "")
+        if command and self.terminal_executor.safe_command(command):
+            return self.terminal_executor.execute_command(command), True
+        return {"error": "Unsafe command blocked"}, False
+    
+    def _tool_web_search(self, params: Dict[str, Any]) -> Tuple[Any, bool]:
+        query = params.get("query", "")
+        if query:
+            return self.web_searcher.search(query), True
+        return {"error": "No search query provided"}, False
+    
+    def _tool_ide_open_file(self, params: Dict[str, Any]) -> Tuple[Any, bool]:
+        file_path = params.get("file_path", "")
+        ide = params.get("ide", "vscode")
+        if not (file_path and os.path.exists(file_path)):
+            return {"error": "File not found or invalid path"}, False
+        if ide == "cursor":
+            success = self.ide_integration.open_file_in_cursor(file_path)
+        else:
+            success = self.ide_integration.open_file_in_vscode(file_path)
+        message = f"File opened in {ide}" if success else f"Failed to open file in {ide}"
+        return {"success": success, "message": message}, success
+    
+    _handlers = {
+        "terminal_execution": _tool_terminal,
+        "web_search": _tool_web_search,
+        "ide_open_file": _tool_ide_open_file,
+    }
+
+
+# Threads whose psutil CPU baseline is set; psutil keeps one baseline per thread
+_cpu_baseline_threads: set = set()
+# Seconds the first CPU sample on a thread is measured over
+_FIRST_CPU_SAMPLE = 0.1
+
+def get_cpu_percent() -> float:
+    """System-wide CPU usage in percent since the previous call on the same thread.
+    
+    Only the first call on a thread blocks, for a short sample that also sets the
+    baseline; later calls return at once. Raises ImportError without psutil.
+    """
+    psutil = _import_optional('psutil', 'metrics')
+    thread_id = threading.get_ident()
+    if thread_id in _cpu_baseline_threads:
+        return psutil.cpu_percent(interval=None)
+    percent = psutil.cpu_percent(interval=_FIRST_CPU_SAMPLE)
+    _cpu_baseline_threads.add(thread_id)
+    return percent
 
 
 def get_system_info() -> Dict[str, Any]:
-    """Get system information - Gemini CLI style system awareness."""
-    cpu_percent = psutil.cpu_percent(interval=1)
+    """Get system information - Gemini CLI style system awareness.
+    
+    CPU usage is measured since the previous call on the same thread (see
+    `get_cpu_percent`). Disk usage is for the filesystem holding the project (or the
+    current directory). Raises ImportError without psutil (the `metrics` extra).
+    """
+    from orby_coder.utils.common import find_project_root
+    psutil = _import_optional('psutil', 'metrics')
+    cpu_percent = get_cpu_percent()
     memory = psutil.virtual_memory()
-    disk = psutil.disk_usage('/')
+    disk = psutil.disk_usage(str(find_project_root() or Path.cwd()))
     
     return {
         'cpu_percent': cpu_percent,
@@ -362,7 +490,7 @@ def get_system_info() -> Dict[str, Any]:
 def copy_to_clipboard(text: str) -> bool:
     """Copy text to clipboard - Gemini CLI style utility."""
     try:
-        pyperclip.copy(text)
+        _import_optional('pyperclip', 'clipboard').copy(text)
         return True
     except Exception:
         return False
@@ -371,34 +499,106 @@ def copy_to_clipboard(text: str) -> bool:
 def paste_from_clipboard() -> str:
     """Paste text from clipboard - Gemini CLI style utility."""
     try:
-        return pyperclip.paste()
+        return _import_optional('pyperclip', 'clipboard').paste()
     except Exception:
         return ""
 
 
+# (real path, mtime of its .git or None) -> whether GitPython opens it as a repository
+_IS_REPO_CACHE: Dict[Tuple[str, Optional[float]], bool] = {}
+
 def is_git_repo(path: str = ".") -> bool:
-    """Check if the current directory is a git repository - Gemini CLI style awareness."""
+    """Check if the current directory is a git repository - Gemini CLI style awareness.
+    
+    Results are cached until the directory's `.git` appears, disappears or changes.
+    Raises ImportError without GitPython (the `git` extra).
+    """
+    real_path = os.path.realpath(path)
     try:
-        Repo(path)
-        return True
-    except:
-        return False
+        git_mtime = os.stat(os.path.join(real_path, '.git')).st_mtime
+    except OSError:
+        git_mtime = None
+    key = (real_path, git_mtime)
+    found = _IS_REPO_CACHE.get(key)
+    if found is None:
+        Repo = _import_optional('git', 'git', 'GitPython').Repo
+        try:
+            Repo(real_path)
+            found = True
+        except Exception:
+            found = False
+        _IS_REPO_CACHE[key] = found
+    return found
+
+
+def _git(path: str, *args: str) -> str:
+    """Run a git command in `path` and return its output; raises RuntimeError with git's message."""
+    result = subprocess.run(
+        ['git', '-C', path, *args],
+        capture_output=True,
+        encoding='utf-8',
+        errors='replace',
+        timeout=COMMAND_TIMEOUT
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or f"git {args[0]} failed")
+    return result.stdout
+
+
+# Number of space-separated fields before the path in each kind of porcelain v2 entry
+_PORCELAIN_PATH_FIELD = {'1': 8, '2': 9, 'u': 10}
+
+
+def _parse_porcelain_status(output: str) -> Tuple[Optional[str], bool, List[str]]:
+    """Parse `git status --porcelain=v2 --branch -z` into (branch, is_dirty, files changed in the work tree)."""
+    branch = None
+    dirty = False
+    changed = []
+    records = iter(output.split('\0'))
+    for record in records:
+        if record.startswith('# branch.head '):
+            branch = record[len('# branch.head '):]
+            continue
+        path_field = _PORCELAIN_PATH_FIELD.get(record[:1])
+        if path_field is None:
+            continue
+        fields = record.split(' ', path_field)
+        if record[0] == '2':
+            next(records, None)  # the path the entry was renamed from
+        dirty = True
+        # XY: index and work tree state; '.' means unchanged, unmerged entries always differ
+        if record[0] == 'u' or fields[1][1] != '.':
+            changed.append(fields[path_field])
+    return branch, dirty, changed
 
 
 def get_git_info(path: str = ".") -> Dict[str, Any]:
-    """Get git repository information - Gemini CLI style project awareness."""
+    """Get git repository information - Gemini CLI style project awareness.
+    
+    Uses one `git status` and one `git log` call; the remote comes from the
+    repository config, which GitPython reads without running git.
+    """
     try:
-        repo = Repo(path)
+        branch, dirty, changed = _parse_porcelain_status(
+            _git(path, 'status', '--porcelain=v2', '--branch', '-z', '--untracked-files=no')
+        )
+        if branch is None or branch == '(detached)':
+            raise RuntimeError("HEAD is detached; there is no active branch")
+        commit_hash, author, committed, message = _git(
+            path, 'log', '-1', '--format=%H%x00%an%x00%ct%x00%B'
+        ).split('\0', 3)
+        Repo = _import_optional('git', 'git', 'GitPython').Repo
+        remotes = Repo(path, search_parent_directories=True).remotes
         return {
-            'active_branch': repo.active_branch.name,
-            'is_dirty': repo.is_dirty(),
-            'uncommitted_files': [item.a_path for item in repo.index.diff(None)],
-            'remote_url': list(repo.remotes)[0].url if repo.remotes else None,
+            'active_branch': branch,
+            'is_dirty': dirty,
+            'uncommitted_files': changed,
+            'remote_url': list(remotes)[0].url if remotes else None,
             'latest_commit': {
-                'hash': repo.head.commit.hexsha,
-                'message': repo.head.commit.message.strip(),
-                'author': repo.head.commit.author.name,
-                'date': datetime.fromtimestamp(repo.head.commit.committed_date).isoformat()
+                'hash': commit_hash,
+                'message': message.strip(),
+                'author': author,
+                'date': datetime.fromtimestamp(int(committed)).isoformat()
             },
             'timestamp': datetime.now().isoformat()
         }
@@ -1,13 +1,29 @@
 """Utility functions for Orby Coder."""
+import functools
 import os
+import re
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 import subprocess
 
+# A fenced code block: group 1 is the info string (language), group 2 the code.
+# A block left open at the end (e.g. the response hit max_tokens) runs to the end.
+CODE_BLOCK_RE = re.compile(r"```([^\n`]*)\n(.*?)(?:```|\Z)", re.DOTALL)
+
+# Files/directories that mark the root of a project
+_PROJECT_MARKERS = (
+    'pyproject.toml', 'setup.py', 'setup.cfg', 'requirements.txt',
+    'Pipfile', 'poetry.lock', '.git', 'package.json', 'Cargo.toml',
+    'go.mod', 'Makefile', 'CMakeLists.txt'
+)
+
 def find_project_root(marker_files: Optional[List[str]] = None) -> Optional[Path]:
     """
     Find the project root by looking for common marker files/directories.
     
+    Results are cached per working directory; call `invalidate_project_root_cache`
+    after creating or removing marker files.
+    
     Args:
         marker_files: List of files/directories that indicate project root.
                      Defaults to common markers like 'pyproject.toml', 'setup.py', etc.
@@ -15,23 +31,59 @@ def find_project_root(marker_files: Optional[List[str]] = None) -> Optional[Path
     Returns:
         Path to project root if found, otherwise None
     """
-    if marker_files is None:
-        marker_files = [
-            'pyproject.toml', 'setup.py', 'setup.cfg', 'requirements.txt',
-            'Pipfile', 'poetry.lock', '.git', 'package.json', 'Cargo.toml',
-            'go.mod', 'Makefile', 'CMakeLists.txt'
-        ]
-    
-    current_path = Path.cwd().resolve()
-    
+    markers = _PROJECT_MARKERS if marker_files is None else tuple(marker_files)
+    return _find_project_root(str(Path.cwd().resolve()), markers)
+
+@functools.lru_cache(maxsize=64)
+def _find_project_root(directory: str, markers: tuple) -> Optional[Path]:
+    """Walk up from a resolved directory, listing each parent once instead of stat-ing every marker."""
+    wanted = frozenset(markers)
+    current = Path(directory)
     # Start from current directory and go up
-    for parent in [current_path] + list(current_path.parents):
-        for marker in marker_files:
-            if (parent / marker).exists():
-                return parent
+    for parent in (current, *current.parents):
+        try:
+            entries = os.listdir(parent)
+        except OSError:
+            continue
+        if not wanted.isdisjoint(entries):
+            return parent
+    return None
+
+def invalidate_project_root_cache():
+    """Forget cached project roots, e.g. after `git init` in a long-running session."""
+    _find_project_root.cache_clear()
+
+# Resolved directory -> the `.git` entry found for it. Only hits are kept, so a
+# `git init` made later is still noticed.
+_GIT_ENTRY_CACHE: Dict[str, Path] = {}
+
+def _find_git_entry(directory: str) -> Optional[Path]:
+    """Return the `.git` directory or gitfile (worktrees, submodules) governing a resolved directory.
     
+    Walks up the parents the way git does, without starting a git process. A cached
+    entry is reused while it still exists; directories outside a repository are
+    checked again on every call.
+    """
+    cached = _GIT_ENTRY_CACHE.get(directory)
+    if cached is not None and cached.exists():
+        return cached
+    current = Path(directory)
+    for parent in (current, *current.parents):
+        candidate = parent / '.git'
+        if candidate.exists():
+            _GIT_ENTRY_CACHE[directory] = candidate
+            return candidate
+    _GIT_ENTRY_CACHE.pop(directory, None)
     return None
 
+def invalidate_git_root_cache():
+    """Forget cached git roots, e.g. after creating a repository nested inside another."""
+    _GIT_ENTRY_CACHE.clear()
+
+def _git_env_overridden() -> bool:
+    """Whether GIT_DIR / GIT_WORK_TREE change where git looks, so only git itself can answer."""
+    return 'GIT_DIR' in os.environ or 'GIT_WORK_TREE' in os.environ
+
 def get_git_root() -> Optional[Path]:
     """
     Get the root of the git repository if in one.
@@ -39,6 +91,9 @@ def get_git_root() -> Optional[Path]:
     Returns:
         Path to git root if in a git repo, otherwise None
     """
+    if not _git_env_overridden():
+        entry = _find_git_entry(str(Path.cwd().resolve()))
+        return entry.parent if entry is not None else None
     try:
         result = subprocess.run(
             ['git', 'rev-parse', '--show-toplevel'],
@@ -61,6 +116,8 @@ def is_git_repo(path: Path) -> bool:
     Returns:
         True if path is inside a git repo, False otherwise
     """
+    if not _git_env_overridden():
+        return _find_git_entry(str(Path(path).resolve())) is not None
     try:
         result = subprocess.run(
             ['git', '-C', str(path), 'rev-parse', '--git-dir'],
@@ -82,12 +139,29 @@ def get_file_encoding(file_path: Path) -> str:
     Returns:
         Detected encoding as a string
     """
-    import chardet
-    
-    with open(file_path, 'rb') as f:
+    stat = file_path.stat()
+    return _detect_encoding(str(file_path), stat.st_mtime_ns, stat.st_size)
+
+# Byte order marks that settle the encoding without chardet
+_BOMS = (
+    (b'\xef\xbb\xbf', 'utf-8-sig'),
+    (b'\xff\xfe\x00\x00', 'utf-32'),
+    (b'\x00\x00\xfe\xff', 'utf-32'),
+    (b'\xff\xfe', 'utf-16'),
+    (b'\xfe\xff', 'utf-16'),
+)
+
+@functools.lru_cache(maxsize=1024)
+def _detect_encoding(path: str, mtime_ns: int, size: int) -> str:
+    """Detect a file's encoding; cached per (path, mtime_ns, size)."""
+    with open(path, 'rb') as f:
         raw_data = f.read(10000)  # Read first 10KB to detect encoding
-        result = chardet.detect(raw_data)
-        return result['encoding'] or 'utf-8'
+    for bom, encoding in _BOMS:
+        if raw_data.startswith(bom):
+            return encoding
+    import chardet
+    result = chardet.detect(raw_data)
+    return result['encoding'] or 'utf-8'
 
 def format_code_block(code: str, language: str = 'python') -> str:
     """
@@ -102,6 +176,25 @@ def format_code_block(code: str, language: str = 'python') -> str:
     """
     return f"```{language}\n{code}\n```"
 
+def extract_code_block(text: str) -> Optional[str]:
+    """
+    Extract the code of the first fenced code block in markdown text.
+    
+    Args:
+        text: Markdown text, e.g. an LLM response
+        
+    Returns:
+        The code without its fences, or None if the text has no code block
+    """
+    match = CODE_BLOCK_RE.search(text)
+    if match is None:
+        return None
+    code = match.group(2)
+    return code[:-1] if code.endswith("\n") else code
+
+# Characters that are unsafe in file names and URLs, all replaced by '_'
+_SANITIZE_TABLE = str.maketrans({c: '_' for c in '/\\ <>:"|?*'})
+
 def sanitize_model_name(model_name: str) -> str:
     """
     Sanitize a model name to be safe for use in file systems and URLs.
@@ -112,12 +205,7 @@ def sanitize_model_name(model_name: str) -> str:
     Returns:
         Sanitized model name
     """
-    # Remove or replace invalid characters
-    sanitized = model_name.replace('/', '_').replace('\\', '_').replace(' ', '_')
-    # Remove other potentially problematic characters
-    for char in '<>:"|?*':
-        sanitized = sanitized.replace(char, '_')
-    return sanitized.strip()
+    return model_name.translate(_SANITIZE_TABLE).strip()
 
 def validate_model_exists(model_name: str, backend: str) -> bool:
     """
@@ -0,0 +1,38 @@
+"""Tests for the dangerous-command check. Nothing here runs a command."""
+import pytest
+
+from orby_coder.utils.advanced import TerminalExecutor
+
+
+@pytest.mark.parametrize("command", [
+    "rm -rf /",
+    "rm -rf /*",
+    "RM -RF / --no-preserve-root",
+    "ls; rm -r /;",
+    "chmod -R 777 /",
+    "dd if=/dev/zero of=disk.img",
+    ":(){:&};:",
+])
+def test_dangerous_commands_are_refused(command):
+    assert not TerminalExecutor.safe_command(command)
+
+
+@pytest.mark.parametrize("command", [
+    "ls -la",
+    "rm -rf /tmp/build",
+    "rm -r ./dist",
+    "chmod -R 777 /var/www/x",
+])
+def test_ordinary_commands_are_allowed(command):
+    assert TerminalExecutor.safe_command(command)
+
+
+def test_only_the_first_cpu_sample_on_a_thread_blocks(monkeypatch):
+    psutil = pytest.importorskip("psutil")
+    from orby_coder.utils import advanced
+
+    intervals = []
+    monkeypatch.setattr(psutil, "cpu_percent", lambda interval: intervals.append(interval) or 12.5)
+    monkeypatch.setattr(advanced, "_cpu_baseline_threads", set())
+    assert [advanced.get_cpu_percent() for _ in range(3)] == [12.5] * 3
+    assert intervals == [advanced._FIRST_CPU_SAMPLE, None, None]
@@ -0,0 +1,21 @@
+"""Tests for the shared helpers."""
+from orby_coder.utils.common import CODE_BLOCK_RE, extract_code_block
+
+
+def test_extracts_the_first_block_and_its_language():
+    text = "Intro\n```python\nprint(1)\n```\nthen\n```js\nx()\n```\n"
+    matches = list(CODE_BLOCK_RE.finditer(text))
+    assert [m.group(1) for m in matches] == ["python", "js"]
+    assert extract_code_block(text) == "print(1)"
+
+
+def test_block_without_a_language():
+    assert extract_code_block("```\nplain\n```") == "plain"
+
+
+def test_unterminated_block_runs_to_the_end():
+    assert extract_code_block("```python\ndef f():\n    return 1\n") == "def f():\n    return 1"
+
+
+def test_text_without_a_block():
+    assert extract_code_block("no code here") is None
@@ -0,0 +1,27 @@
+"""Tests for the prompt trigger scanner."""
+from orby_coder.core.llm_provider import _scan_triggers
+
+
+def test_no_triggers():
+    assert _scan_triggers("refactor this function") == {}
+
+
+def test_reports_the_end_of_each_trigger():
+    prompt = "execute: ls -la"
+    found = _scan_triggers(prompt)
+    assert prompt[found["execute:"]:] == " ls -la"
+
+
+def test_matching_ignores_case_and_keys_are_lowercase():
+    found = _scan_triggers("Search: textual widgets")
+    assert "search:" in found
+
+
+def test_overlapping_triggers_are_all_reported():
+    found = _scan_triggers("can you run: pytest")
+    assert {"can you run", "run:"} <= found.keys()
+
+
+def test_only_the_first_occurrence_is_kept():
+    prompt = "run: make && run: make test"
+    assert _scan_triggers(prompt)["run:"] == len("run:")
@@ -0,0 +1,50 @@
+"""Tests for shrinking source files before they go into prompts."""
+from orby_coder.core.prompt_compress import build_code_summary, compress
+
+
+def _module(functions=20, body_lines=30):
+    parts = []
+    for i in range(functions):
+        body = "\n".join(f"    x{j} = {j}" for j in range(body_lines))
+        parts.append(f'def func_{i}(a, b):\n    """Docstring {i}."""\n{body}\n    return a\n')
+    return "\n".join(parts)
+
+
+def test_small_code_is_unchanged():
+    code = "def f():\n    return 1\n"
+    assert compress(code, ".py", max_tokens=100) == code
+
+
+def test_python_keeps_signatures_and_docstrings():
+    code = _module()
+    result = compress(code, ".py", max_tokens=500)
+    assert len(result) < len(code)
+    for i in range(20):
+        assert f"def func_{i}(a, b):" in result
+        assert f'"""Docstring {i}."""' in result
+
+
+def test_keyword_functions_are_kept_intact():
+    code = _module()
+    result = compress(code, ".py", max_tokens=500, keywords=["func_3"])
+    start = result.index("def func_3(")
+    assert "    x29 = 29" in result[start:result.index("def func_4(")]
+
+
+def test_other_languages_get_an_outline():
+    code = "\n".join(f"int f{i}(int a) {{\n" + "    a++;\n" * 40 + "    return a;\n}" for i in range(20))
+    result = compress(code, ".c", max_tokens=300)
+    assert result.startswith("Definitions in this file:")
+    assert "int f19(int a) {" in result
+
+
+def test_summary_adds_a_python_outline():
+    summary = build_code_summary("class A:\n    def m(self):\n        pass\n", ".py")
+    assert summary.startswith("Outline (line numbers):")
+    assert "class A" in summary and "def m(self)" in summary
+
+
+def test_one_line_functions_keep_their_signature():
+    code = "".join(f"def short_{i}(x): return x + {'1' * 300}\n" for i in range(20))
+    result = compress(code, ".py", max_tokens=1000)
+    assert "def short_0(x): return x" in result
@@ -0,0 +1,96 @@
+"""Tests for the on-disk response cache."""
+from types import SimpleNamespace
+
+from orby_coder.core.response_cache import ResponseCache
+
+
+class CountingLLM:
+    """Stand-in provider that records how often it was asked."""
+
+    def __init__(self, response="generated answer"):
+        self.config = SimpleNamespace(default_model="m", temperature=0.7, max_tokens=None)
+        self.response = response
+        self.calls = 0
+
+    def chat_complete(self, messages, model=None):
+        self.calls += 1
+        return self.response
+
+    def stream_chat(self, messages, model=None, **kwargs):
+        self.calls += 1
+        yield from (self.response[i:i + 4] for i in range(0, len(self.response), 4))
+
+
+MESSAGES = [{"role": "user", "content": "hello"}]
+
+
+def test_set_then_get(tmp_path):
+    cache = ResponseCache(path=tmp_path / "cache.db")
+    cache.set("k", "value")
+    assert cache.get("k") == "value"
+    assert cache.get("missing") is None
+
+
+def test_entries_survive_a_new_instance(tmp_path):
+    ResponseCache(path=tmp_path / "cache.db").set("k", "value")
+    assert ResponseCache(path=tmp_path / "cache.db").get("k") == "value"
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = ResponseCache(path=tmp_path / "cache.db", ttl=-1)
+    cache.set("k", "value")
+    assert cache.get("k") is None
+    assert ResponseCache(path=tmp_path / "cache.db").get("k") is None
+
+
+def test_disabled_cache_stores_nothing(tmp_path):
+    cache = ResponseCache(path=tmp_path / "cache.db", enabled=False)
+    cache.set("k", "value")
+    assert cache.get("k") is None
+    assert not (tmp_path / "cache.db").exists()
+
+
+def test_make_key_covers_model_sampling_and_messages():
+    key = ResponseCache.make_key("m", MESSAGES, 0.7, None)
+    assert key == ResponseCache.make_key("m", [dict(MESSAGES[0])], 0.7, None)
+    assert key != ResponseCache.make_key("other", MESSAGES, 0.7, None)
+    assert key != ResponseCache.make_key("m", MESSAGES, 0.2, None)
+    assert key != ResponseCache.make_key("m", MESSAGES, 0.7, 100)
+    assert key != ResponseCache.make_key("m", [{"role": "user", "content": "bye"}], 0.7, None)
+
+
+def test_search_key_ignores_case_and_spacing():
+    assert ResponseCache.make_search_key("Python  asyncio") == ResponseCache.make_search_key("python asyncio ")
+
+
+def test_chat_complete_calls_the_llm_once(tmp_path):
+    cache = ResponseCache(path=tmp_path / "cache.db")
+    llm = CountingLLM()
+    assert cache.chat_complete(llm, MESSAGES) == "generated answer"
+    assert cache.chat_complete(llm, MESSAGES) == "generated answer"
+    assert llm.calls == 1
+
+
+def test_stream_chat_replays_a_consumed_stream(tmp_path):
+    cache = ResponseCache(path=tmp_path / "cache.db")
+    llm = CountingLLM("x" * 200)
+    assert "".join(cache.stream_chat(llm, MESSAGES)) == "x" * 200
+    assert "".join(cache.stream_chat(llm, MESSAGES)) == "x" * 200
+    assert llm.calls == 1
+
+
+def test_stream_chat_does_not_store_an_abandoned_stream(tmp_path):
+    cache = ResponseCache(path=tmp_path / "cache.db")
+    llm = CountingLLM("partial answer")
+    stream = cache.stream_chat(llm, MESSAGES)
+    next(stream)
+    stream.close()
+    assert cache.get(cache.request_key(llm, MESSAGES)) is None
+
+
+def test_file_key_covers_sampling_settings():
+    key = ResponseCache.make_file_key("m", "explain", "sha", "sys", 0.7, None)
+    assert key == ResponseCache.make_file_key("m", "explain", "sha", "sys", 0.7, None)
+    assert key != ResponseCache.make_file_key("m", "analyze", "sha", "sys", 0.7, None)
+    assert key != ResponseCache.make_file_key("m", "explain", "sha", "sys", 0.2, None)
+    assert key != ResponseCache.make_file_key("m", "explain", "sha", "sys", 0.7, 256)
@@ -0,0 +1,31 @@
+"""Tests for the run command's compile cache key."""
+from orby_coder.commands.run import _build_hash
+
+
+def _hash(source):
+    return _build_hash(source, source.read_bytes(), ["gcc", "-O2"])
+
+
+def test_nested_header_changes_the_hash(tmp_path):
+    (tmp_path / "inc").mkdir()
+    source = tmp_path / "main.c"
+    source.write_text('#include "inc/a.h"\nint main(void) { return X; }\n')
+    (tmp_path / "inc" / "a.h").write_text('#include "b.h"\n')
+    (tmp_path / "inc" / "b.h").write_text("#define X 1\n")
+    before = _hash(source)
+    (tmp_path / "inc" / "b.h").write_text("#define X 2\n")
+    assert _hash(source) != before
+
+
+def test_include_cycles_terminate(tmp_path):
+    source = tmp_path / "main.c"
+    source.write_text('#include "a.h"\n')
+    (tmp_path / "a.h").write_text('#include "b.h"\n')
+    (tmp_path / "b.h").write_text('#include "a.h"\n')
+    assert _hash(source) == _hash(source)
+
+
+def test_compile_command_is_part_of_the_hash(tmp_path):
+    source = tmp_path / "main.c"
+    source.write_text("int main(void) { return 0; }\n")
+    assert _build_hash(source, source.read_bytes(), ["gcc"]) != _build_hash(source, source.read_bytes(), ["g++"])
@@ -0,0 +1,38 @@
+"""Tests for the paraphrased-prompt cache."""
+from orby_coder.core.semantic_cache import SemanticCache
+
+
+def make_cache(tmp_path, threshold=0.9, **kwargs):
+    return SemanticCache(threshold, path=tmp_path / "cache.db", **kwargs)
+
+
+def test_matches_a_paraphrase_that_only_adds_filler_words(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.add("m", "ctx", "sort the list then reverse it", "answer")
+    assert cache.lookup("m", "ctx", "Please sort the list, then reverse it") == "answer"
+
+
+def test_reordered_words_do_not_match(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.add("m", "ctx", "sort the list then reverse it", "answer")
+    assert cache.lookup("m", "ctx", "reverse the list then sort it") is None
+
+
+def test_model_and_context_must_be_identical(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.add("m", "ctx", "add type hints", "answer")
+    assert cache.lookup("other", "ctx", "add type hints") is None
+    assert cache.lookup("m", "edited ctx", "add type hints") is None
+
+
+def test_disabled_without_a_threshold(tmp_path):
+    cache = SemanticCache(path=tmp_path / "cache.db")
+    cache.add("m", "ctx", "add type hints", "answer")
+    assert cache.lookup("m", "ctx", "add type hints") is None
+    assert not (tmp_path / "cache.db").exists()
+
+
+def test_expired_entries_are_ignored(tmp_path):
+    cache = make_cache(tmp_path, ttl=-1)
+    cache.add("m", "ctx", "add type hints", "answer")
+    assert cache.lookup("m", "ctx", "add type hints") is None
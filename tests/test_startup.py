@@ -0,0 +1,34 @@
+"""Startup budget: `orby` must stay fast to launch, so heavy imports stay lazy."""
+import subprocess
+import sys
+
+# Cumulative microseconds `import orby_coder.__main__` may take
+_IMPORT_BUDGET_US = 300_000
+# Packages that only specific commands need; none may load for `orby --help`
+_LAZY_PACKAGES = ("torch", "textual", "ollama", "openai", "watchdog", "git", "psutil")
+
+
+def _import_times(code):
+    """Run `code` under -X importtime and return {module: cumulative microseconds}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_main_module_import_budget():
+    times = _import_times("import orby_coder.__main__")
+    assert times["orby_coder.__main__"] < _IMPORT_BUDGET_US
+
+
+def test_root_help_imports_no_heavy_packages():
+    times = _import_times("import sys; sys.argv = ['orby', '--help']; from orby_coder.cli import main; main()")
+    loaded = {name.split(".")[0] for name in times}
+    assert loaded.isdisjoint(_LAZY_PACKAGES)